@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Security
-from schemas.recipe import BookmarkCreate, BookmarkOut
-from crud.recipe import add_bookmark, remove_bookmark, get_user_bookmarks
+from fastapi import APIRouter, Depends, HTTPException, status, Security, Query
+from schemas.recipe import BookmarkCreate, BookmarkOut, BookmarkedRecipePage
+from crud.recipe import add_bookmark, remove_bookmark, get_user_bookmarks, get_user_bookmarked_recipes, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from crud.user import get_current_user, oauth2_scheme
-from typing import List
+from db.session import get_recipe_db
+from typing import List, Literal, Optional
 
 router = APIRouter()
 
@@ -11,16 +12,18 @@ async def create_bookmark(
     bookmark: BookmarkCreate,
     token: str = Security(oauth2_scheme),
     user_id: str = Depends(get_current_user),
+    recipe_db=Depends(get_recipe_db),
 ):
-    return await add_bookmark(user_id, bookmark.recipe_id)
+    return await add_bookmark(user_id, bookmark.recipe_id, recipe_db)
 
 @router.delete("/{recipe_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_bookmark(
     recipe_id: str,
     token: str = Security(oauth2_scheme),
     user_id: str = Depends(get_current_user),
+    recipe_db=Depends(get_recipe_db),
 ):
-    result = await remove_bookmark(user_id, recipe_id)
+    result = await remove_bookmark(user_id, recipe_id, recipe_db)
     if result["deleted"] == 0:
         raise HTTPException(status_code=404, detail="Bookmark not found")
     return
@@ -30,4 +33,23 @@ async def list_bookmarks(
     token: str = Security(oauth2_scheme),
     user_id: str = Depends(get_current_user),
 ):
-    return await get_user_bookmarks(user_id) 
\ No newline at end of file
+    return await get_user_bookmarks(user_id)
+
+@router.get(
+    "/recipes",
+    response_model=BookmarkedRecipePage,
+    summary="북마크한 레시피 목록 조회",
+    description="북마크한 레시피를 최신 북마크순으로 페이지 단위로 반환합니다. fields=card이면 카드 표시용 필드만 포함합니다."
+)
+async def list_bookmarked_recipes(
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="페이지 크기"),
+    fields: Literal["full", "card"] = Query("full", description="레시피 필드 범위"),
+    token: str = Security(oauth2_scheme),
+    user_id: str = Depends(get_current_user),
+    recipe_db=Depends(get_recipe_db),
+):
+    try:
+        return await get_user_bookmarked_recipes(recipe_db, user_id, cursor, limit, card=(fields == "card"))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
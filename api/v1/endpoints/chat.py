@@ -1,12 +1,15 @@
 from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional
-import requests
 from core.config import AI_DATA_URL
+from core.http_client import get_ai_client, AI_TIMEOUTS
+import asyncio
 import json
 from db.session import get_recipe_db, get_chat_db
-from crud.recipe import create_recipe as crud_create_recipe
+from crud.recipe import create_recipes_bulk as crud_create_recipes_bulk
 from crud.chat import add_chat_message as crud_add_chat_message
+from utils.response_parser import clean_message, is_json_message
 import httpx
 
 class ChatProxyRequest(BaseModel):
@@ -25,6 +28,105 @@ class ChatProxyResponse(BaseModel):
 
 router = APIRouter()
 
+def _build_ai_payload(req: ChatProxyRequest) -> dict:
+    """AI 서버로 보낼 payload에 사용자 컨텍스트를 포함해 구성합니다."""
+    return {
+        "messages": [{"role": m["role"], "content": m["content"]} for m in req.messages],
+        "session_id": req.session_id,
+        "feature": req.feature,
+        "allergies": req.allergies,
+        "constitution": req.constitution,
+        "dietary_restrictions": req.dietary_restrictions,
+        "health_conditions": req.health_conditions
+    }
+
+async def _save_user_message(chat_db, req: ChatProxyRequest) -> None:
+    """사용자가 보낸 마지막 메시지를 DB에 저장합니다."""
+    if req.session_id and req.messages:
+        last_msg = req.messages[-1]
+        if last_msg.get('role') == 'user':
+            await crud_add_chat_message(chat_db, req.session_id, 'user', last_msg.get('content'))
+
+async def _store_recipes(recipe_db, message: str) -> str:
+    """
+    LLM이 반환한 레시피 JSON 리스트를 일괄 저장하고, 저장된 레시피(id 포함) JSON 문자열을 반환합니다.
+    저장에 실패하면 원본 메시지를 그대로 반환합니다.
+    """
+    try:
+        recipes_list = json.loads(message)
+        saved = await crud_create_recipes_bulk(recipe_db, recipes_list)
+        # 내부 MongoDB ObjectId는 응답에서 제외
+        stored = [{k: v for k, v in doc.items() if k != '_id'} for doc in saved]
+        print("레시피 일괄 저장 성공: total=", len(stored))
+        return json.dumps(stored, ensure_ascii=False, default=str)
+    except Exception as e:
+        print("레시피 일괄 저장 실패:", e)
+        return message
+
+# 취소에서 보호된 채 진행 중인 assistant 메시지 저장 작업 (완료 전에 GC되지 않도록 참조 유지)
+_pending_saves: set[asyncio.Task] = set()
+
+async def _save_assistant_message(chat_db, session_id: str, message: str) -> None:
+    """
+    assistant 메시지를 저장합니다. 스트림이 클라이언트 연결 끊김으로 취소되어도 저장은 끝까지 진행되도록
+    별도 작업으로 실행하고 취소에서 보호(asyncio.shield)합니다.
+    """
+    task = asyncio.ensure_future(crud_add_chat_message(chat_db, session_id, 'assistant', message))
+    _pending_saves.add(task)
+    task.add_done_callback(_pending_saves.discard)
+    await asyncio.shield(task)
+
+def _sse_event(event: str, data: dict) -> str:
+    """SSE 이벤트 한 건을 직렬화합니다."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def _upstream_token(data: str) -> str:
+    """
+    업스트림 SSE 이벤트의 data를 토큰 텍스트로 변환합니다.
+    JSON 객체면 content/token/message 필드를, 그 밖에는 data 문자열 자체를 토큰으로 사용합니다.
+    """
+    try:
+        parsed = json.loads(data)
+    except ValueError:
+        return data
+    if isinstance(parsed, dict):
+        for key in ("content", "token", "message"):
+            if isinstance(parsed.get(key), str):
+                return parsed[key]
+        return ""
+    return parsed if isinstance(parsed, str) else data
+
+async def _iter_upstream_tokens(resp: httpx.Response):
+    """
+    업스트림 스트리밍 응답에서 토큰 텍스트를 꺼냅니다.
+    text/event-stream이면 SSE 줄을 파싱해 'data:' 값만 이벤트 단위로 모으고('[DONE]'은 종료 신호),
+    그 밖의 응답은 도착한 텍스트 청크를 그대로 토큰으로 사용합니다.
+    """
+    if not resp.headers.get("content-type", "").startswith("text/event-stream"):
+        async for chunk in resp.aiter_text():
+            if chunk:
+                yield chunk
+        return
+    data_lines: list[str] = []
+    async for line in resp.aiter_lines():
+        if line.startswith("data:"):
+            value = line[5:]
+            data_lines.append(value[1:] if value.startswith(" ") else value)
+            continue
+        if line or not data_lines:
+            continue  # event:/id:/주석 줄은 무시
+        data = "\n".join(data_lines)
+        data_lines = []
+        if data.strip() == "[DONE]":
+            return
+        token = _upstream_token(data)
+        if token:
+            yield token
+    if data_lines and "\n".join(data_lines).strip() != "[DONE]":
+        token = _upstream_token("\n".join(data_lines))
+        if token:
+            yield token
+
 @router.post(
     "",
     response_model=ChatProxyResponse,
@@ -41,22 +143,9 @@ async def proxy_chat(
         print(f"AI_DATA_URL: {AI_DATA_URL}")
         print(f"req: {req.dict()}")
         # 사용자가 보낸 메시지를 DB에 저장
-        if req.session_id and req.messages:
-            last_msg = req.messages[-1]
-            if last_msg.get('role') == 'user':
-                await crud_add_chat_message(chat_db, req.session_id, 'user', last_msg.get('content'))
-        url = f"{AI_DATA_URL}/api/v1/constitution_recipe"
-        # AI 서버로 보낼 payload에 사용자 컨텍스트 포함
-        payload = {
-            "messages": [{"role": m["role"], "content": m["content"]} for m in req.messages],
-            "session_id": req.session_id,
-            "feature": req.feature,
-            "allergies": req.allergies,
-            "constitution": req.constitution,
-            "dietary_restrictions": req.dietary_restrictions,
-            "health_conditions": req.health_conditions
-        }
-        resp = requests.post(url, json=payload, timeout=None)
+        await _save_user_message(chat_db, req)
+        payload = _build_ai_payload(req)
+        resp = await get_ai_client().post("/api/v1/constitution_recipe", json=payload, timeout=AI_TIMEOUTS["chat"])
         print(f"status_code: {resp.status_code}")
         try:
             data = resp.json()
@@ -67,21 +156,7 @@ async def proxy_chat(
             raise HTTPException(status_code=500, detail=f"AI 서버 응답이 JSON이 아님: {resp.text}")
         resp.raise_for_status()
         if data.get("is_recipe") and isinstance(data.get("message"), str):
-            try:
-                recipes_list = json.loads(data["message"])
-                # 리다이렉트 없이 올바른 스킴과 호스트를 사용하기 위해 base_url 활용
-                api_base = str(request.base_url).rstrip("/")
-                stored = []
-                # 리다이렉트를 따라가도록 설정
-                async with httpx.AsyncClient(follow_redirects=True) as client:
-                    for recipe in recipes_list:
-                        r = await client.post(f"{api_base}/api/v1/recipes/save", json=recipe, follow_redirects=True)
-                        r.raise_for_status()
-                        stored.append(r.json())
-                data["message"] = json.dumps(stored, ensure_ascii=False)
-                print("레시피 API 저장 및 업데이트 성공: total=", len(stored))
-            except Exception as e:
-                print("레시피 API 저장 실패:", e)
+            data["message"] = await _store_recipes(recipe_db, data["message"])
         if "message" not in data:
             raise HTTPException(status_code=500, detail=f"AI 서버 응답에 'message' 필드가 없음: {data}")
         # 백엔드로부터 받은 응답을 DB에 저장
@@ -91,4 +166,71 @@ async def proxy_chat(
         return ChatProxyResponse(message=data["message"], is_recipe=data.get("is_recipe", False))
     except Exception as e:
         print(f"Error: {e}")
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post(
+    "/stream",
+    summary="사용자-LLM 프록시 챗 (스트리밍)",
+    description=(
+        "LLM 서비스의 응답 토큰을 도착하는 즉시 SSE(text/event-stream)로 전달합니다. "
+        "'token' 이벤트로 부분 응답을, 스트림 종료 후 'done' 이벤트로 최종 메시지와 is_recipe를 보냅니다. "
+        "LLM 서비스에 스트리밍 엔드포인트가 없으면(404) 일반 응답을 받아 한 번의 'token' 이벤트로 보냅니다."
+    )
+)
+async def proxy_chat_stream(
+    req: ChatProxyRequest,
+    recipe_db=Depends(get_recipe_db),
+    chat_db=Depends(get_chat_db)
+):
+    await _save_user_message(chat_db, req)
+    payload = _build_ai_payload(req)
+
+    async def event_stream():
+        chunks: list[str] = []
+        upstream_recipe = False
+        saved = False
+        try:
+            try:
+                async with get_ai_client().stream(
+                    "POST", "/api/v1/constitution_recipe/stream", json=payload, timeout=AI_TIMEOUTS["chat"]
+                ) as resp:
+                    stream_missing = resp.status_code == 404
+                    if not stream_missing:
+                        resp.raise_for_status()
+                        async for token in _iter_upstream_tokens(resp):
+                            chunks.append(token)
+                            yield _sse_event("token", {"content": token})
+                if stream_missing:
+                    # 스트리밍을 지원하지 않는 LLM 서비스: 일반 프록시와 같은 엔드포인트로 한 번에 받음
+                    resp = await get_ai_client().post("/api/v1/constitution_recipe", json=payload, timeout=AI_TIMEOUTS["chat"])
+                    resp.raise_for_status()
+                    data = resp.json()
+                    if not isinstance(data, dict) or not isinstance(data.get("message"), str):
+                        raise ValueError(f"AI 서버 응답에 'message' 필드가 없음: {data}")
+                    upstream_recipe = bool(data.get("is_recipe"))
+                    chunks.append(data["message"])
+                    yield _sse_event("token", {"content": data["message"]})
+            except (httpx.HTTPError, ValueError) as e:
+                print(f"Stream error: {e}")
+                yield _sse_event("error", {"detail": str(e)})
+                return
+            # 스트림 종료 후 최종 메시지 처리: 레시피 저장 및 assistant 메시지 저장
+            message = "".join(chunks)
+            is_recipe = upstream_recipe or is_json_message(message)
+            if is_recipe:
+                message = await _store_recipes(recipe_db, clean_message(message))
+            if req.session_id:
+                await _save_assistant_message(chat_db, req.session_id, message)
+            saved = True
+            yield _sse_event("done", {"message": message, "is_recipe": is_recipe})
+        finally:
+            # 클라이언트 연결 끊김(취소)이나 오류로 끝나도 그때까지 받은 부분 응답을 저장
+            partial = "".join(chunks)
+            if not saved and req.session_id and partial:
+                await _save_assistant_message(chat_db, req.session_id, partial)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -16,9 +16,12 @@ from crud.chat import (
     delete_session_and_messages
 )
 from db.session import get_chat_db
+from utils.fast_json import BulkSerializer, fast_list_response
 
 router = APIRouter()
 
+chat_message_serializer = BulkSerializer(ChatMessageOut)
+
 @router.post(
     "/session",
     response_model=ChatSessionOut,
@@ -80,7 +83,7 @@ async def get_messages(
     db=Depends(get_chat_db)
 ):
     try:
-        return await get_session_messages(db, session_id)
+        return fast_list_response(chat_message_serializer, await get_session_messages(db, session_id))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
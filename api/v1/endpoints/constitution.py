@@ -1,9 +1,8 @@
 from fastapi import APIRouter, HTTPException, Depends, Security, Request
 from pydantic import BaseModel
 from typing import List, Dict, Optional
-import requests
 import json
-from core.config import AI_DATA_URL
+from core.http_client import get_ai_client, AI_TIMEOUTS
 from db.session import get_user_db
 from bson import ObjectId
 from crud.user import get_current_user, oauth2_scheme
@@ -35,7 +34,7 @@ async def proxy_constitution(
     try:
         payload = {"answers": req.answers}
         # LLM 진단 서비스 호출 (trailing slash 필수)
-        resp = requests.post(f"{AI_DATA_URL}/api/v1/diagnose/", json=payload, timeout=None)
+        resp = await get_ai_client().post("/api/v1/diagnose/", json=payload, timeout=AI_TIMEOUTS["constitution"])
         try:
             data = resp.json()
         except Exception as err:
@@ -49,7 +48,7 @@ async def proxy_constitution(
                 "constitution_reason": data["reason"],
                 "constitution_confidence": data["confidence"]
             }
-            await db["users"].update_one({"_id": ObjectId(user_id)}, {"$set": update_fields})
+            await db["users"].update_one({"_id": ObjectId(user_id)}, {"$set": update_fields, "$inc": {"version": 1}})
         # 결과 반환
         return ConstitutionResponse(**data)
     except HTTPException:
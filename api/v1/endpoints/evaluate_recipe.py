@@ -1,8 +1,7 @@
 from fastapi import APIRouter, HTTPException, Depends, Request
 from pydantic import BaseModel
 from typing import Optional
-import requests
-from core.config import AI_DATA_URL
+from core.http_client import get_ai_client, AI_TIMEOUTS
 import json
 from db.session import get_recipe_db, get_chat_db
 from crud.recipe import create_recipe as crud_create_recipe
@@ -13,7 +12,6 @@ router = APIRouter()
 
 @router.post("/")
 async def evaluate_recipe(qa_history_json: str):
-    url = f"{AI_DATA_URL}/api/v1/evaluate_recipe"
     payload = {"qa_history_json": qa_history_json}
-    response = requests.post(url, json=payload)
+    response = await get_ai_client().post("/api/v1/evaluate_recipe", json=payload, timeout=AI_TIMEOUTS["evaluate"])
     return response.json()
@@ -1,35 +1,167 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Security
-from db.session import get_recipe_db
-from schemas.recipe import Recipe, BookmarkCreate, BookmarkOut, RecipeUpdateRequest
+from fastapi import APIRouter, Depends, HTTPException, status, Security, Query, Request, Response
+from db.session import get_recipe_db, get_user_db
+from bson import ObjectId
+from schemas.recipe import Recipe, RecipePage, AutocompleteSuggestion, BookmarkCreate, BookmarkOut, RecipeUpdateRequest
 from crud.recipe import create_recipe as crud_create_recipe, get_recipe_by_id as crud_get_recipe_by_id, add_bookmark, remove_bookmark, get_user_bookmarks, update_recipe as crud_update_recipe
+from crud.recipe import list_recipes_page, build_recipe_filter, build_exclusion_filter, get_popular_recipes, get_recommended_recipes, search_recipes, get_recipe_etag, recipe_etag, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from crud.recipe import delete_all_recipes as crud_delete_all_recipes, create_recipes_bulk as crud_create_recipes_bulk
 from crud.user import get_current_user, oauth2_scheme
-from typing import List
+from typing import List, Optional
 from schemas.auto_generate import AutoGenerateRecipeRequest
 import httpx
-from core.config import AI_DATA_URL
+from pydantic import ValidationError
+from core.http_client import fetch_generated_recipes
+from utils.singleflight import SingleFlight
+from utils.recipe_stock import take_stocked_recipes
+from utils.recipe_autocomplete import recipe_autocomplete
+from utils.fast_json import BulkSerializer, FastJSONResponse, dump_model_json
+from utils.etag import etag_matches, set_etag_headers, not_modified, RECIPE_CACHE_CONTROL
+from core.config import settings
 
 router = APIRouter()
 
+recipe_serializer = BulkSerializer(Recipe)
+
+# 동일한 자동 생성 요청 합치기 (정규화된 요청 -> 진행 중인 생성+저장 작업)
+auto_generate_flight = SingleFlight()
+
+@router.get(
+    "/",
+    response_model=RecipePage,
+    summary="레시피 목록 조회 (페이지네이션)",
+    description="커서 기반으로 레시피 목록을 페이지 단위로 반환합니다. category, difficulty, 체질, 주요 재료로 필터링할 수 있습니다."
+)
+async def list_recipes(
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="페이지 크기"),
+    category: Optional[str] = Query(None, description="카테고리"),
+    difficulty: Optional[str] = Query(None, description="난이도"),
+    suitableBodyTypes: Optional[List[str]] = Query(None, description="적합 체질 (모두 포함)"),
+    keyIngredients: Optional[List[str]] = Query(None, description="주요 재료 (모두 포함)"),
+    allergies: Optional[List[str]] = Query(None, description="제외할 알레르기 유발 재료"),
+    dietary_restrictions: Optional[List[str]] = Query(None, description="식이 제한 (예: 채식, 비건, 글루텐프리)"),
+    db=Depends(get_recipe_db),
+):
+    """필터 조건에 맞는 레시피를 최신순으로 한 페이지 조회합니다."""
+    filters = build_recipe_filter(category, difficulty, suitableBodyTypes, keyIngredients)
+    filters.update(build_exclusion_filter(allergies, dietary_restrictions))
+    try:
+        page = await list_recipes_page(db, filters, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if settings.FAST_JSON_RESPONSES:
+        return FastJSONResponse(dump_model_json(RecipePage.model_construct(
+            items=recipe_serializer.construct(page["items"]), next_cursor=page["next_cursor"],
+        )))
+    return page
+
 @router.get(
     "/get_all_recipes",
     response_model=List[Recipe],
-    summary="모든 레시피 조회",
-    description="MongoDB 'recipes' 컬렉션에 저장된 모든 레시피를 반환합니다."
+    summary="모든 레시피 조회 (deprecated)",
+    description="하위 호환용 엔드포인트입니다. 전체 덤프 대신 최신 레시피 한 페이지만 반환하며, 나머지는 Link 헤더(rel=\"next\")의 GET /recipes/ 커서로 이어서 조회하세요.",
+    deprecated=True,
+)
+async def list_all_recipes(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="조회할 레시피 수"),
+    db=Depends(get_recipe_db),
+):
+    """
+    최신 레시피 한 페이지를 리스트 형태로 반환합니다.
+    리스트 응답에는 다음 커서를 담을 수 없으므로 Deprecation 헤더와 함께 Link 헤더로 GET /recipes/ 의 다음 페이지를 알려 줍니다.
+    """
+    page = await list_recipes_page(db, limit=limit)
+    successor = request.url_for("list_recipes")
+    links = [f'<{successor}>; rel="successor-version"']
+    if page["next_cursor"]:
+        links.append(f'<{successor.include_query_params(cursor=page["next_cursor"], limit=limit)}>; rel="next"')
+    response.headers["Deprecation"] = "true"
+    response.headers["Link"] = ", ".join(links)
+    return page["items"]
+
+@router.get(
+    "/search",
+    response_model=List[Recipe],
+    summary="레시피 검색",
+    description="제목, 설명, 재료, 태그를 대상으로 레시피를 검색해 관련도 순으로 반환합니다. 카테고리, 난이도, 체질, 알레르기 조건을 함께 적용할 수 있습니다."
 )
-async def list_recipes(db=Depends(get_recipe_db)):
-    """저장된 모든 레시피를 조회하여 반환합니다."""
-    docs = await db['recipes'].find().to_list(length=1000)
-    for doc in docs:
-        doc['id'] = str(doc['_id'])
-    return docs
+async def search_recipe_list(
+    q: str = Query(..., min_length=1, max_length=100, description="검색어"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="조회할 레시피 수"),
+    category: Optional[str] = Query(None, description="카테고리"),
+    difficulty: Optional[str] = Query(None, description="난이도"),
+    constitution: Optional[str] = Query(None, description="적합 체질"),
+    allergies: Optional[List[str]] = Query(None, description="제외할 알레르기 유발 재료"),
+    dietary_restrictions: Optional[List[str]] = Query(None, description="식이 제한 (예: 채식, 비건, 글루텐프리)"),
+    db=Depends(get_recipe_db),
+):
+    return await search_recipes(db, q, category, difficulty, constitution, allergies, dietary_restrictions, limit)
+
+@router.get(
+    "/autocomplete",
+    response_model=List[AutocompleteSuggestion],
+    summary="검색어 자동완성",
+    description="입력한 접두사로 시작하는 레시피 제목, 재료, 태그를 평점과 북마크 수 기준으로 추천합니다."
+)
+async def autocomplete_recipes(
+    q: str = Query(..., min_length=1, max_length=50, description="입력 중인 검색어"),
+    limit: int = Query(10, ge=1, le=50, description="최대 후보 수"),
+    type: Optional[str] = Query(None, pattern="^(title|ingredient|tag)$", description="후보 종류 (title, ingredient, tag)"),
+):
+    return recipe_autocomplete.suggest(q, limit, type)
+
+@router.get(
+    "/popular",
+    response_model=List[Recipe],
+    summary="인기 레시피 조회",
+    description="북마크 수가 많은 순으로 레시피를 반환합니다. 체질로 필터링할 수 있습니다."
+)
+async def list_popular_recipes(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="조회할 레시피 수"),
+    constitution: Optional[str] = Query(None, description="적합 체질"),
+    allergies: Optional[List[str]] = Query(None, description="제외할 알레르기 유발 재료"),
+    dietary_restrictions: Optional[List[str]] = Query(None, description="식이 제한 (예: 채식, 비건, 글루텐프리)"),
+    db=Depends(get_recipe_db),
+):
+    return await get_popular_recipes(db, limit, constitution, build_exclusion_filter(allergies, dietary_restrictions))
+
+@router.get(
+    "/recommended",
+    response_model=List[Recipe],
+    summary="개인화 추천 레시피 조회",
+    description="로그인한 사용자의 체질, 알레르기, 건강 목표를 기반으로 추천 레시피를 반환합니다."
+)
+async def list_recommended_recipes(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="조회할 레시피 수"),
+    allergies: Optional[List[str]] = Query(None, description="프로필 외에 추가로 제외할 알레르기 유발 재료"),
+    dietary_restrictions: Optional[List[str]] = Query(None, description="식이 제한 (예: 채식, 비건, 글루텐프리)"),
+    token: str = Security(oauth2_scheme),
+    user_id: str = Depends(get_current_user),
+    user_db=Depends(get_user_db),
+    db=Depends(get_recipe_db),
+):
+    profile = await user_db["users"].find_one(
+        {"_id": ObjectId(user_id)}, {"constitution": 1, "allergies": 1, "health_goals": 1}
+    )
+    if not profile:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return await get_recommended_recipes(db, profile, limit, allergies, dietary_restrictions)
 
 @router.get(
     "/{recipe_id}", response_model=Recipe, summary="레시피 조회"
 )
-async def read_recipe(recipe_id: str, db=Depends(get_recipe_db)):
+async def read_recipe(recipe_id: str, request: Request, response: Response, db=Depends(get_recipe_db)):
+    # If-None-Match가 있으면 버전 필드만으로 ETag를 비교해, 바뀌지 않았으면 본문 없이 304 반환
+    if request.headers.get("if-none-match"):
+        etag = await get_recipe_etag(db, recipe_id)
+        if etag and etag_matches(request, etag):
+            return not_modified(etag, RECIPE_CACHE_CONTROL)
     recipe_doc = await crud_get_recipe_by_id(db, recipe_id)
     if not recipe_doc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="레시피를 찾을 수 없습니다.")
+    set_etag_headers(response, recipe_etag(recipe_doc), RECIPE_CACHE_CONTROL)
     return recipe_doc
 
 @router.post(
@@ -75,35 +207,58 @@ async def create_recipe_slash(recipe: Recipe, db=Depends(get_recipe_db)):
     return await crud_create_recipe(db, recipe.model_dump())
 
 @router.post(
-    "/auto_generate",
+    "/save_bulk",
     response_model=List[Recipe],
-    summary="자동 레시피 생성",
-    description="체질 및 선택 항목 기반 자동 레시피 생성"
+    status_code=status.HTTP_201_CREATED,
+    summary="레시피 일괄 생성",
+    description="레시피 JSON 리스트를 받아 한 번의 insert_many로 MongoDB 'recipes' 컬렉션에 저장합니다."
 )
-async def auto_generate_recipe(req: AutoGenerateRecipeRequest, db=Depends(get_recipe_db)):
-    """Ai-Data LLM 서비스에 요청해 자동 생성된 레시피를 반환합니다."""
-    url = f"{AI_DATA_URL}/api/v1/constitution_recipe/auto_generate"
+async def create_recipes_bulk(recipes: List[Recipe], db=Depends(get_recipe_db)):
+    """요청 본문에서 이미 검증된 레시피 리스트를 재검증 없이 일괄 저장합니다."""
+    return await crud_create_recipes_bulk(db, [recipe.model_dump() for recipe in recipes], validate=False)
+
+def _auto_generate_key(payload: dict) -> tuple:
+    """자동 생성 요청을 정규화한 키 (공백/대소문자, 주요 재료 순서와 중복 차이는 같은 요청으로 취급)."""
+    def norm(value):
+        return value.strip().lower() if isinstance(value, str) and value.strip() else None
+    ingredients = tuple(sorted({norm(i) for i in payload.get("keyIngredients") or []} - {None}))
+    return norm(payload.get("constitution")), norm(payload.get("category")), norm(payload.get("difficulty")), ingredients
+
+async def _generate_and_save(db, payload: dict) -> list[dict]:
+    """LLM 서비스로 레시피를 생성하고 일괄 저장합니다. 실패 시 HTTPException을 발생시킵니다."""
     # LLM 서비스 호출: timeout 및 오류 처리
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        try:
-            resp = await client.post(url, json=req.dict())
-            resp.raise_for_status()
-        except httpx.ReadTimeout:
-            raise HTTPException(status_code=504, detail="LLM 레시피 서비스 호출 타임아웃")
-        except httpx.HTTPError as e:
-            raise HTTPException(status_code=502, detail=f"LLM 레시피 생성 실패: {e}")
-    # JSON 응답 파싱
     try:
-        generated = resp.json()
+        generated = await fetch_generated_recipes(payload)
+    except httpx.ReadTimeout:
+        raise HTTPException(status_code=504, detail="LLM 레시피 서비스 호출 타임아웃")
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"LLM 레시피 생성 실패: {e}")
     except ValueError:
         raise HTTPException(status_code=502, detail="LLM 응답 JSON 파싱 실패")
 
-    # DB에 저장 및 반환
-    saved_recipes: list[dict] = []
-    for item in generated:
-        saved = await crud_create_recipe(db, item)
-        saved_recipes.append(saved)
-    return saved_recipes 
+    # DB에 일괄 저장 및 반환
+    try:
+        return await crud_create_recipes_bulk(db, generated)
+    except ValidationError as e:
+        raise HTTPException(status_code=502, detail=f"LLM 레시피 형식 오류: {e}")
+
+@router.post(
+    "/auto_generate",
+    response_model=List[Recipe],
+    summary="자동 레시피 생성",
+    description="체질 및 선택 항목 기반 자동 레시피 생성"
+)
+async def auto_generate_recipe(req: AutoGenerateRecipeRequest, db=Depends(get_recipe_db)):
+    """
+    Ai-Data LLM 서비스에 요청해 자동 생성된 레시피를 저장 후 반환합니다.
+    미리 생성해 둔 재고가 있으면 LLM을 기다리지 않고 재고를 저장해 바로 반환합니다.
+    재고가 없을 때 같은 조건의 요청이 동시에 들어오면 LLM 호출과 저장을 한 번만 수행하고 결과를 함께 반환합니다.
+    """
+    payload = req.model_dump()
+    stocked = await take_stocked_recipes(db, payload)
+    if stocked:
+        return await crud_create_recipes_bulk(db, stocked, validate=False)
+    return await auto_generate_flight.do(_auto_generate_key(payload), lambda: _generate_and_save(db, payload))
 
 @router.delete(
     "/delete_all",
@@ -114,13 +269,13 @@ async def auto_generate_recipe(req: AutoGenerateRecipeRequest, db=Depends(get_re
 async def delete_all_recipes(db=Depends(get_recipe_db)):
     """저장된 모든 레시피를 삭제합니다."""
     try:
-        result = await db['recipes'].delete_many({})
-        if result.deleted_count == 0:
+        deleted_count = await crud_delete_all_recipes(db)
+        if deleted_count == 0:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="삭제할 레시피가 없습니다."
             )
-        return {"message": f"{result.deleted_count}개의 레시피가 삭제되었습니다."}
+        return {"message": f"{deleted_count}개의 레시피가 삭제되었습니다."}
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,8 +1,22 @@
-from fastapi import APIRouter, Depends
-from typing import List
+from fastapi import APIRouter, Depends, Request, Response
+from typing import List, Dict, Any
 from db.session import get_recipe_db
 from schemas.recipe_stats import RecipeStat
-from crud.recipe_stats import generate_recipe_stats, get_recipe_stats
+from crud.recipe_stats import generate_recipe_stats, get_recipe_stats, get_recipe_stats_version
+from crud.recipe import recipe_cache
+from crud.user import token_cache
+from core.security import password_hasher_stats
+from db.pool_metrics import pool_metrics
+from core.compression import compression_stats
+from utils.recipe_indexes import recipe_indexes_stats
+from utils.recommender import recipe_recommender
+from utils.allergen_filter import allergen_filter
+from utils.recipe_dedup import recipe_dedup
+from utils.recipe_search import recipe_search_index
+from utils.recipe_autocomplete import recipe_autocomplete
+from api.v1.endpoints.recipe import auto_generate_flight
+from utils.recipe_stock import recipe_stock_stats
+from utils.etag import make_etag, etag_matches, set_etag_headers, not_modified, STATS_CACHE_CONTROL
 
 router = APIRouter()
 
@@ -12,6 +26,30 @@ async def generate_stats(db=Depends(get_recipe_db)) -> List[RecipeStat]:
     return await generate_recipe_stats(db)
 
 @router.get("/", response_model=List[RecipeStat], summary="레시피 통계 조회", description="저장된 레시피 통계를 조회합니다.")
-async def retrieve_stats(db=Depends(get_recipe_db)) -> List[RecipeStat]:
-    """저장된 레시피 통계를 반환합니다."""
-    return await get_recipe_stats(db) 
\ No newline at end of file
+async def retrieve_stats(request: Request, response: Response, db=Depends(get_recipe_db)) -> List[RecipeStat]:
+    """저장된 레시피 통계를 반환합니다. 스냅샷 버전이 If-None-Match와 같으면 본문 없이 304를 반환합니다."""
+    # 버전을 본문보다 먼저 읽어, ETag가 본문보다 새로운 상태를 가리키는 일이 없도록 함
+    etag = make_etag('recipe_stats', await get_recipe_stats_version(db))
+    if etag_matches(request, etag):
+        return not_modified(etag, STATS_CACHE_CONTROL)
+    set_etag_headers(response, etag, STATS_CACHE_CONTROL)
+    return await get_recipe_stats(db)
+
+@router.get("/runtime", response_model=Dict[str, Any], summary="런타임 지표 조회", description="현재 워커 프로세스의 캐시 등 런타임 지표를 반환합니다.")
+async def retrieve_runtime_stats() -> Dict[str, Any]:
+    """캐시 hit/miss/eviction 등 프로세스 내 지표를 반환합니다."""
+    return {
+        "recipe_cache": recipe_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "password_hasher": password_hasher_stats(),
+        "mongo_pool": pool_metrics.stats(),
+        "compression": compression_stats(),
+        "recipe_indexes": recipe_indexes_stats(),
+        "recommender": recipe_recommender.stats(),
+        "allergen_filter": allergen_filter.stats(),
+        "recipe_dedup": recipe_dedup.stats(),
+        "recipe_search": recipe_search_index.stats(),
+        "recipe_autocomplete": recipe_autocomplete.stats(),
+        "auto_generate_singleflight": auto_generate_flight.stats(),
+        "recipe_stock": recipe_stock_stats(),
+    }
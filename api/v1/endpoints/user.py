@@ -1,15 +1,20 @@
 # api/v1/endpoints/user.py
-from fastapi import APIRouter, HTTPException, Depends, Security, status, Query, Form
+from fastapi import APIRouter, HTTPException, Depends, Security, status, Query, Form, Request, Response
 from fastapi.security import OAuth2PasswordBearer
 
 from schemas.user import Token, SignupResponse, UserCreate, UserOut, UserProfileUpdate, UserLogin
 from crud.user import create_user, get_user_by_email, get_current_user, oauth2_scheme
-from core.security import create_access_token, verify_password, hash_password
+from core.security import create_access_token, verify_password_async, hash_password_async
 from db.session import get_user_db
 from bson import ObjectId
+from utils.etag import make_etag, etag_matches, set_etag_headers, not_modified, USER_CACHE_CONTROL
 
 router = APIRouter()
 
+def user_etag(user_id: str, user_doc: dict) -> str:
+    """사용자 문서의 version(프로필/체질 수정 시 증가)으로 ETag를 만듭니다."""
+    return make_etag("user", user_id, user_doc.get("version", 0))
+
 @router.get("/email-exists")
 async def email_exists(email: str = Query(...), db=Depends(get_user_db)):
     existing_user = await db["users"].find_one({"email": email})
@@ -20,7 +25,7 @@ async def signup(user: UserCreate, db=Depends(get_user_db)):
     existing_user = await db["users"].find_one({"email": user.email})
     if existing_user:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already registered")
-    user.password = hash_password(user.password)
+    user.password = await hash_password_async(user.password)
     created_user = await create_user(db, user)
     response_user = UserOut.from_mongo(created_user)
     access_token = create_access_token(data={"sub": str(created_user["id"])})
@@ -37,7 +42,7 @@ async def update_profile(
     print('profile.illnesses:', profile.illnesses)
     await db["users"].update_one(
         {"_id": ObjectId(user_id)},
-        {"$set": profile.model_dump(exclude_unset=True)}
+        {"$set": profile.model_dump(exclude_unset=True), "$inc": {"version": 1}}
     )
     updated_user = await db["users"].find_one({"_id": ObjectId(user_id)})
     return UserOut.from_mongo(updated_user)
@@ -49,7 +54,7 @@ async def login(
     db=Depends(get_user_db),
 ):
     db_user = await get_user_by_email(db, username)
-    if not db_user or not verify_password(password, db_user["password"]):
+    if not db_user or not await verify_password_async(password, db_user["password"]):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     access_token = create_access_token(data={"sub": str(db_user["_id"])})
     return {"access_token": access_token, "token_type": "bearer"}
@@ -65,11 +70,21 @@ async def logout():
     description="토큰을 통해 현재 로그인한 사용자 정보를 반환합니다."
 )
 async def get_current_user_profile(
+    request: Request,
+    response: Response,
     token: str = Security(oauth2_scheme),
     user_id: str = Depends(get_current_user),
     db=Depends(get_user_db)
 ):
+    # If-None-Match가 있으면 version 필드만 조회해 비교하고, 바뀌지 않았으면 본문 없이 304 반환
+    if request.headers.get("if-none-match"):
+        version_doc = await db["users"].find_one({"_id": ObjectId(user_id)}, {"version": 1})
+        if version_doc:
+            etag = user_etag(user_id, version_doc)
+            if etag_matches(request, etag):
+                return not_modified(etag, USER_CACHE_CONTROL)
     user_doc = await db["users"].find_one({"_id": ObjectId(user_id)})
     if not user_doc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    set_etag_headers(response, user_etag(user_id, user_doc), USER_CACHE_CONTROL)
     return UserOut.from_mongo(user_doc)
\ No newline at end of file
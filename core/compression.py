@@ -0,0 +1,235 @@
+# core/compression.py -- 응답 압축 ASGI 미들웨어 (gzip, brotli 설치 시 br)
+# 실험 목록/채팅 기록처럼 수 MB에 달하는 JSON 응답을 Accept-Encoding 협상으로 압축합니다.
+# - 본문이 COMPRESSION_MIN_SIZE보다 작으면 압축하지 않습니다.
+# - buffered 모드: 본문 전체를 모아 한 번에 압축합니다. (압축률이 좋고 Content-Length를 유지, 큰 본문은 스레드에서 압축)
+# - streaming 모드: 임계값을 넘은 뒤부터 청크마다 압축해 바로 보냅니다. (StreamingResponse의 첫 바이트 지연 최소화)
+# - text/event-stream, 이미 인코딩된 응답, Cache-Control: no-transform 응답, COMPRESSION_EXCLUDE_PATHS 경로는 건너뜁니다.
+import asyncio
+import time
+import zlib
+from core.config import settings
+
+try:
+    import brotli
+except ImportError:  # requirements.txt에 포함되어 있지만, 설치되지 않은 환경에서는 gzip만 사용
+    brotli = None
+
+# 이 크기 이상의 본문은 이벤트 루프를 막지 않도록 스레드에서 압축
+OFFLOAD_MIN_SIZE = 256 * 1024
+_SKIP_CONTENT_TYPES = ("text/event-stream", "image/", "video/", "audio/", "application/zip", "application/gzip")
+
+_metrics = {
+    "compressed": 0,        # 압축한 응답 수
+    "skipped": 0,           # 크기/협상/제외 조건으로 압축하지 않은 응답 수
+    "bytes_in": 0,          # 압축 전 바이트
+    "bytes_out": 0,         # 압축 후 바이트
+    "cpu_seconds": 0.0,     # 압축에 사용한 CPU 시간
+    "by_encoding": {},
+}
+
+
+def compression_stats() -> dict:
+    saved = _metrics["bytes_in"] - _metrics["bytes_out"]
+    return {
+        **_metrics,
+        "by_encoding": dict(_metrics["by_encoding"]),
+        "bytes_saved": saved,
+        "ratio": round(_metrics["bytes_out"] / _metrics["bytes_in"], 4) if _metrics["bytes_in"] else None,
+        "cpu_ms_per_mb_saved": round(_metrics["cpu_seconds"] * 1000 / (saved / 1_000_000), 3) if saved > 0 else None,
+    }
+
+
+def _accepted_encodings(header: str) -> dict[str, float]:
+    """Accept-Encoding 헤더를 {인코딩: q} 로 파싱합니다."""
+    accepted = {}
+    for part in header.lower().split(","):
+        token, _, params = part.strip().partition(";")
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[token] = q
+    return accepted
+
+
+def choose_encoding(header: str) -> str | None:
+    """클라이언트가 허용한 인코딩 중 br(설치된 경우) > gzip 순으로 선택합니다."""
+    accepted = _accepted_encodings(header or "")
+    wildcard = accepted.get("*", 0.0)
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    best, best_q = None, 0.0
+    for encoding in candidates:
+        q = accepted.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class _Compressor:
+    """gzip/brotli 스트리밍 압축기. 사용한 CPU 시간을 지표에 누적합니다."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._impl = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        else:
+            self._impl = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def _timed(self, fn, *args) -> bytes:
+        started = time.thread_time()
+        data = fn(*args)
+        _metrics["cpu_seconds"] += time.thread_time() - started
+        return data
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        """data를 압축합니다. flush=True면 지금까지의 입력을 클라이언트가 바로 풀 수 있도록 내보냅니다."""
+        if self.encoding == "br":
+            out = self._timed(self._impl.process, data)
+            return out + self._timed(self._impl.flush) if flush else out
+        out = self._timed(self._impl.compress, data)
+        return out + self._timed(self._impl.flush, zlib.Z_SYNC_FLUSH) if flush else out
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == "br":
+            return self._timed(self._impl.process, data) + self._timed(self._impl.finish)
+        return self._timed(self._impl.compress, data) + self._timed(self._impl.flush)
+
+
+def _compress_all(encoding: str, body: bytes) -> bytes:
+    return _Compressor(encoding).finish(body)
+
+
+class CompressionMiddleware:
+    """Accept-Encoding 협상 기반 응답 압축 미들웨어 (순수 ASGI, 스트리밍 응답 지원)."""
+
+    def __init__(self, app, minimum_size: int | None = None, streaming: bool | None = None,
+                 exclude_paths: list[str] | None = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+        self.streaming = settings.COMPRESSION_STREAMING if streaming is None else streaming
+        self.exclude_paths = tuple(settings.COMPRESSION_EXCLUDE_PATHS if exclude_paths is None else exclude_paths)
+        if brotli is None:
+            print("[compression] brotli 모듈이 없어 gzip만 사용합니다 (COMPRESSION_BROTLI_QUALITY 무시됨)")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exclude_paths):
+            await self.app(scope, receive, send)
+            return
+        accept = ""
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        responder = _CompressionResponder(send, choose_encoding(accept), self.minimum_size, self.streaming)
+        await self.app(scope, receive, responder)
+
+
+class _CompressionResponder:
+    def __init__(self, send, encoding: str | None, minimum_size: int, streaming: bool):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.streaming = streaming
+        self.start_message: dict | None = None
+        self.buffer = bytearray()
+        self.compressor: _Compressor | None = None
+        self.passthrough = False
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            headers = {name.lower(): value for name, value in message.get("headers", [])}
+            content_type = headers.get(b"content-type", b"").decode("latin-1").lower()
+            if message["status"] < 200 or message["status"] in (204, 304) \
+                    or b"content-encoding" in headers \
+                    or b"no-transform" in headers.get(b"cache-control", b"").lower() \
+                    or content_type.startswith(_SKIP_CONTENT_TYPES):
+                self.passthrough = True
+            else:
+                # 같은 URL이라도 Accept-Encoding에 따라 본문이 달라지므로 캐시에 알림
+                self._add_vary(message)
+                if self.encoding is None:
+                    self.passthrough = True
+            if self.passthrough:
+                _metrics["skipped"] += 1
+                await self.send(message)
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is not None:
+            # streaming 모드로 이미 압축 전송 중
+            chunk = self.compressor.compress(body, flush=True) if more_body else self.compressor.finish(body)
+            _metrics["bytes_in"] += len(body)
+            _metrics["bytes_out"] += len(chunk)
+            await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+            return
+
+        self.buffer += body
+        if not more_body:
+            await self._send_buffered()
+        elif self.streaming and len(self.buffer) >= self.minimum_size:
+            await self._start_streaming()
+
+    @staticmethod
+    def _add_vary(message: dict) -> None:
+        headers = message.setdefault("headers", [])
+        for i, (name, value) in enumerate(headers):
+            if name.lower() == b"vary":
+                if b"accept-encoding" not in value.lower():
+                    headers[i] = (name, value + b", Accept-Encoding")
+                return
+        headers.append((b"vary", b"Accept-Encoding"))
+
+    def _compressed_headers(self, content_length: int | None) -> list:
+        headers = []
+        for name, value in self.start_message.get("headers", []):
+            lowered = name.lower()
+            if lowered == b"content-length":
+                continue
+            if lowered == b"etag" and not value.startswith(b"W/"):
+                # 인코딩이 바뀐 표현은 바이트가 다르므로 강한 ETag를 약한 ETag로 변환
+                value = b"W/" + value
+            headers.append((name, value))
+        headers.append((b"content-encoding", self.encoding.encode()))
+        if content_length is not None:
+            headers.append((b"content-length", str(content_length).encode()))
+        return headers
+
+    async def _send_buffered(self) -> None:
+        body = bytes(self.buffer)
+        if len(body) < self.minimum_size:
+            _metrics["skipped"] += 1
+            await self.send(self.start_message)
+            await self.send({"type": "http.response.body", "body": body, "more_body": False})
+            return
+        if len(body) >= OFFLOAD_MIN_SIZE:
+            compressed = await asyncio.to_thread(_compress_all, self.encoding, body)
+        else:
+            compressed = _compress_all(self.encoding, body)
+        self._record(len(body), len(compressed))
+        await self.send({**self.start_message, "headers": self._compressed_headers(len(compressed))})
+        await self.send({"type": "http.response.body", "body": compressed, "more_body": False})
+
+    async def _start_streaming(self) -> None:
+        self.compressor = _Compressor(self.encoding)
+        body = bytes(self.buffer)
+        self.buffer.clear()
+        chunk = self.compressor.compress(body, flush=True)
+        self._record(len(body), len(chunk))
+        await self.send({**self.start_message, "headers": self._compressed_headers(None)})
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": True})
+
+    def _record(self, bytes_in: int, bytes_out: int) -> None:
+        _metrics["compressed"] += 1
+        _metrics["bytes_in"] += bytes_in
+        _metrics["bytes_out"] += bytes_out
+        _metrics["by_encoding"][self.encoding] = _metrics["by_encoding"].get(self.encoding, 0) + 1
@@ -7,10 +7,54 @@ class Settings(BaseSettings):
     MONGO_USER_DB_NAME: str = Field(..., alias="MONGO_USER_DB_NAME")   # 사용자 정보용 DB 이름
     MONGO_RECIPE_DB_NAME: str = Field(..., alias="MONGO_RECIPE_DB_NAME") # 레시피 정보용 DB 이름
     MONGO_CHAT_DB_NAME: str = Field(..., alias="MONGO_CHAT_DB_NAME")   # 채팅 정보용 DB 이름
+    MONGO_MAX_POOL_SIZE: int = Field(50, alias="MONGO_MAX_POOL_SIZE")  # 프로세스당 최대 커넥션 수
+    MONGO_MIN_POOL_SIZE: int = Field(0, alias="MONGO_MIN_POOL_SIZE")  # 미리 유지할 최소 커넥션 수
+    MONGO_MAX_IDLE_TIME_MS: int = Field(300000, alias="MONGO_MAX_IDLE_TIME_MS")  # 유휴 커넥션 유지 시간(ms)
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = Field(10000, alias="MONGO_WAIT_QUEUE_TIMEOUT_MS")  # 커넥션 체크아웃 대기 한도(ms)
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = Field(5000, alias="MONGO_SERVER_SELECTION_TIMEOUT_MS")  # 서버 선택 타임아웃(ms)
+    MONGO_CONNECT_TIMEOUT_MS: int = Field(10000, alias="MONGO_CONNECT_TIMEOUT_MS")  # 커넥션 연결 타임아웃(ms)
     SECRET_KEY: str = Field(..., alias="SECRET_KEY")  # 비밀 키
     ALGORITHM: str = Field(..., alias="ALGORITHM")  # 기본 알고리즘 설정 (선택사항)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(..., alias="ACCESS_TOKEN_EXPIRE_MINUTES")
     AI_DATA_URL: str = Field(..., alias="AI_DATA_URL")
+    AI_HTTP_MAX_CONNECTIONS: int = Field(100, alias="AI_HTTP_MAX_CONNECTIONS")  # AI 서비스 최대 동시 연결 수
+    AI_HTTP_MAX_KEEPALIVE: int = Field(20, alias="AI_HTTP_MAX_KEEPALIVE")  # 유지할 keep-alive 연결 수
+    AI_HTTP_KEEPALIVE_EXPIRY: float = Field(30.0, alias="AI_HTTP_KEEPALIVE_EXPIRY")  # keep-alive 유지 시간(초)
+    AI_CONNECT_TIMEOUT: float = Field(5.0, alias="AI_CONNECT_TIMEOUT")  # AI 서비스 연결 타임아웃(초)
+    AI_TIMEOUT_CHAT: float = Field(180.0, alias="AI_TIMEOUT_CHAT")  # 채팅 프록시 읽기 타임아웃(초)
+    AI_TIMEOUT_CONSTITUTION: float = Field(60.0, alias="AI_TIMEOUT_CONSTITUTION")  # 체질 진단 읽기 타임아웃(초)
+    AI_TIMEOUT_EXPERIMENT: float = Field(900.0, alias="AI_TIMEOUT_EXPERIMENT")  # 실험 평가 읽기 타임아웃(초)
+    AI_TIMEOUT_EVALUATE: float = Field(120.0, alias="AI_TIMEOUT_EVALUATE")  # 레시피 평가 읽기 타임아웃(초)
+    AI_TIMEOUT_AUTO_GENERATE: float = Field(60.0, alias="AI_TIMEOUT_AUTO_GENERATE")  # 자동 생성 읽기 타임아웃(초)
+    EXPERIMENT_CHUNK_SIZE: int = Field(5, alias="EXPERIMENT_CHUNK_SIZE")  # 실험 작업에서 한 번에 AI 서비스로 보낼 대화 수
+    EXPERIMENT_CONCURRENCY: int = Field(4, alias="EXPERIMENT_CONCURRENCY")  # 실험 작업의 동시 청크 요청 수
+    PASSWORD_HASH_WORKERS: int = Field(2, alias="PASSWORD_HASH_WORKERS")  # bcrypt 전용 스레드 수
+    PASSWORD_HASH_MAX_QUEUE: int = Field(64, alias="PASSWORD_HASH_MAX_QUEUE")  # bcrypt 작업 최대 대기 수
+    TOKEN_CACHE_MAXSIZE: int = Field(10000, alias="TOKEN_CACHE_MAXSIZE")  # 검증된 JWT 캐시 최대 항목 수
+    TOKEN_CACHE_DEFAULT_TTL: float = Field(300.0, alias="TOKEN_CACHE_DEFAULT_TTL")  # exp가 없는 토큰의 캐시 유지 시간(초)
+    RECIPE_CACHE_MAXSIZE: int = Field(2048, alias="RECIPE_CACHE_MAXSIZE")  # 레시피 캐시 최대 항목 수
+    RECIPE_CACHE_TTL: float = Field(300.0, alias="RECIPE_CACHE_TTL")  # 레시피 캐시 만료 시간(초)
+    RECIPE_INDEX_REFRESH_SECONDS: float = Field(300.0, alias="RECIPE_INDEX_REFRESH_SECONDS")  # 메모리 인덱스 증분 갱신 주기(초, 0이면 비활성)
+    RECIPE_DEDUP_THRESHOLD: float = Field(0.8, alias="RECIPE_DEDUP_THRESHOLD")  # 중복 레시피로 판단할 추정 유사도(0~1)
+    RECIPE_GENERATOR_ENABLED: bool = Field(False, alias="RECIPE_GENERATOR_ENABLED")  # 앱 lifespan에서 예약 레시피 생성 실행 여부
+    RECIPE_GENERATOR_INTERVAL_MINUTES: float = Field(60.0, alias="RECIPE_GENERATOR_INTERVAL_MINUTES")  # 예약 생성 주기(분)
+    RECIPE_GENERATOR_BATCH_SIZE: int = Field(30, alias="RECIPE_GENERATOR_BATCH_SIZE")  # 한 번에 보낼 생성 요청 수
+    RECIPE_GENERATOR_CONCURRENCY: int = Field(4, alias="RECIPE_GENERATOR_CONCURRENCY")  # 동시 생성 요청 수
+    RECIPE_STOCK_ENABLED: bool = Field(False, alias="RECIPE_STOCK_ENABLED")  # 자동 생성 요청을 미리 생성한 재고로 먼저 처리할지 여부
+    RECIPE_STOCK_REFILLER_ENABLED: bool = Field(False, alias="RECIPE_STOCK_REFILLER_ENABLED")  # 이 프로세스에서 재고 보충 작업 실행 여부 (한 워커에서만)
+    RECIPE_STOCK_REFILL_SECONDS: float = Field(60.0, alias="RECIPE_STOCK_REFILL_SECONDS")  # 재고 보충 주기(초)
+    RECIPE_STOCK_LEAD_TICKS: float = Field(3.0, alias="RECIPE_STOCK_LEAD_TICKS")  # 목표 재고 = 주기당 소진 속도 x 이 값
+    RECIPE_STOCK_MIN_PER_CELL: int = Field(1, alias="RECIPE_STOCK_MIN_PER_CELL")  # 요청이 있었던 칸의 최소 재고
+    RECIPE_STOCK_MAX_PER_CELL: int = Field(20, alias="RECIPE_STOCK_MAX_PER_CELL")  # 칸별 최대 재고
+    RECIPE_STOCK_MAX_REFILL_PER_TICK: int = Field(30, alias="RECIPE_STOCK_MAX_REFILL_PER_TICK")  # 한 주기에 보낼 최대 생성 요청 수
+    RECIPE_STOCK_REFILL_CONCURRENCY: int = Field(4, alias="RECIPE_STOCK_REFILL_CONCURRENCY")  # 재고 보충 동시 생성 요청 수
+    FAST_JSON_RESPONSES: bool = Field(False, alias="FAST_JSON_RESPONSES")  # 목록 API에서 재검증 없는 경량 JSON 직렬화 사용 여부
+    COMPRESSION_ENABLED: bool = Field(True, alias="COMPRESSION_ENABLED")  # 응답 압축 미들웨어 사용 여부
+    COMPRESSION_MIN_SIZE: int = Field(1024, alias="COMPRESSION_MIN_SIZE")  # 이 크기(바이트) 미만 응답은 압축하지 않음
+    COMPRESSION_STREAMING: bool = Field(False, alias="COMPRESSION_STREAMING")  # True면 청크 단위 스트리밍 압축, False면 본문 전체를 모아 압축
+    COMPRESSION_GZIP_LEVEL: int = Field(6, alias="COMPRESSION_GZIP_LEVEL")  # gzip 압축 레벨(1~9)
+    COMPRESSION_BROTLI_QUALITY: int = Field(4, alias="COMPRESSION_BROTLI_QUALITY")  # brotli 품질(0~11)
+    COMPRESSION_EXCLUDE_PATHS: list[str] = Field(default_factory=lambda: ["/api/v1/users/chat/stream"], alias="COMPRESSION_EXCLUDE_PATHS")  # 압축하지 않을 경로 접두사
 
     class Config:
         # .env 파일에서 환경변수를 읽어옵니다.
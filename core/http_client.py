@@ -0,0 +1,50 @@
+# core/http_client.py -- AI_DATA 서비스 호출용 공유 비동기 HTTP 클라이언트
+# 앱 lifespan 동안 하나의 httpx.AsyncClient를 유지하여 keep-alive 커넥션을 재사용합니다.
+import httpx
+from contextlib import asynccontextmanager
+from core.config import settings
+
+# 엔드포인트별 타임아웃 (연결 타임아웃은 공통, 읽기 타임아웃은 LLM 작업 길이에 맞춤)
+AI_TIMEOUTS: dict[str, httpx.Timeout] = {
+    "chat": httpx.Timeout(settings.AI_TIMEOUT_CHAT, connect=settings.AI_CONNECT_TIMEOUT),
+    "constitution": httpx.Timeout(settings.AI_TIMEOUT_CONSTITUTION, connect=settings.AI_CONNECT_TIMEOUT),
+    "experiment": httpx.Timeout(settings.AI_TIMEOUT_EXPERIMENT, connect=settings.AI_CONNECT_TIMEOUT),
+    "evaluate": httpx.Timeout(settings.AI_TIMEOUT_EVALUATE, connect=settings.AI_CONNECT_TIMEOUT),
+    "auto_generate": httpx.Timeout(settings.AI_TIMEOUT_AUTO_GENERATE, connect=settings.AI_CONNECT_TIMEOUT),
+}
+
+# 레시피 자동 생성 (예약 생성 작업, POST /recipes/auto_generate, 레시피 재고 보충에서 공유)
+AUTO_GENERATE_PATH = "/api/v1/constitution_recipe/auto_generate"
+
+ai_client: httpx.AsyncClient | None = None
+
+# AI 클라이언트 초기화 및 종료
+@asynccontextmanager
+async def init_ai_client(app=None):
+    global ai_client
+    ai_client = httpx.AsyncClient(
+        base_url=settings.AI_DATA_URL,
+        limits=httpx.Limits(
+            max_connections=settings.AI_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.AI_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=settings.AI_HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(settings.AI_TIMEOUT_CHAT, connect=settings.AI_CONNECT_TIMEOUT),
+    )
+    try:
+        yield
+    finally:
+        await ai_client.aclose()
+        ai_client = None
+        print("AI HTTP 클라이언트 종료")
+
+def get_ai_client() -> httpx.AsyncClient:
+    if ai_client is None:
+        raise Exception("AI HTTP 클라이언트가 초기화되지 않았습니다.")
+    return ai_client
+
+async def fetch_generated_recipes(payload: dict) -> list[dict]:
+    """AI 서비스에 레시피 자동 생성을 요청해 생성된 레시피 리스트(저장 전)를 반환합니다. 실패 시 httpx 예외를 발생시킵니다."""
+    resp = await get_ai_client().post(AUTO_GENERATE_PATH, json=payload, timeout=AI_TIMEOUTS["auto_generate"])
+    resp.raise_for_status()
+    return resp.json()
@@ -1,10 +1,13 @@
 from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import time
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, Depends
 
 
-from core.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from core.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, settings
 from schemas.user import TokenData  # 토큰에서 뽑아낸 정보 담을 스키마
 
 
@@ -27,6 +30,66 @@ def verify_password(plain_pw: str, hashed_pw: str) -> bool:
     return pwd_context.verify(plain_pw, hashed_pw)
 
 
+# bcrypt는 호출당 수십 ms의 CPU를 사용하므로 이벤트 루프가 아닌 전용 스레드 풀에서 실행
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
+# 워커 수 + 대기열 한도를 넘는 요청은 즉시 503으로 거절
+_password_max_in_flight = settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_QUEUE
+_password_metrics = {
+    "completed": 0,
+    "rejected": 0,
+    "in_flight": 0,
+    "max_in_flight": 0,
+    "total_wait_seconds": 0.0,
+    "total_run_seconds": 0.0,
+}
+
+def _timed_call(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, started, time.perf_counter()
+
+async def _run_password_task(fn, *args):
+    if _password_metrics["in_flight"] >= _password_max_in_flight:
+        _password_metrics["rejected"] += 1
+        raise HTTPException(status_code=503, detail="Too many concurrent password operations")
+    submitted = time.perf_counter()
+    _password_metrics["in_flight"] += 1
+    _password_metrics["max_in_flight"] = max(_password_metrics["max_in_flight"], _password_metrics["in_flight"])
+    try:
+        loop = asyncio.get_running_loop()
+        result, started, finished = await loop.run_in_executor(_password_executor, _timed_call, fn, *args)
+    finally:
+        _password_metrics["in_flight"] -= 1
+    _password_metrics["completed"] += 1
+    _password_metrics["total_wait_seconds"] += started - submitted
+    _password_metrics["total_run_seconds"] += finished - started
+    return result
+
+# 비밀번호 해시 함수 (스레드 풀에서 실행)
+async def hash_password_async(password: str) -> str:
+    return await _run_password_task(hash_password, password)
+
+# 비밀번호 검증 함수 (스레드 풀에서 실행)
+async def verify_password_async(plain_pw: str, hashed_pw: str) -> bool:
+    return await _run_password_task(verify_password, plain_pw, hashed_pw)
+
+def password_hasher_stats() -> dict:
+    """비밀번호 해시 스레드 풀의 대기열 깊이 및 처리 시간 지표를 반환합니다."""
+    completed = _password_metrics["completed"]
+    in_flight = _password_metrics["in_flight"]
+    return {
+        **_password_metrics,
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "max_queue": settings.PASSWORD_HASH_MAX_QUEUE,
+        "queue_depth": max(0, in_flight - settings.PASSWORD_HASH_WORKERS),
+        "avg_wait_ms": _password_metrics["total_wait_seconds"] / completed * 1000 if completed else 0.0,
+        "avg_run_ms": _password_metrics["total_run_seconds"] / completed * 1000 if completed else 0.0,
+    }
+
+
 # 토큰 생성 함수
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
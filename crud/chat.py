@@ -48,7 +48,6 @@ async def add_chat_message(db, session_id: str, role: str, content: str):
 
 async def get_session_messages(db, session_id: str):
     msgs = await db["chat_messages"].find({"session_id": ObjectId(session_id)}).sort("created_at", 1).to_list(1000)
-    print("메세지:", msgs)
     return [
         {
             "id": str(m["_id"]),
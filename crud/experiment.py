@@ -1,6 +1,57 @@
 # Backend/crud/experiment.py
 # 실험 결과를 저장하는 CRUD 유틸리티
 from datetime import datetime
+from typing import List, Dict, Any
+
+# 메시지당 비용 정규화 범위 및 종합 점수 가중치
+EXPECTED_MIN_COST = 0.00001
+EXPECTED_MAX_COST = 0.01
+RECIPE_WEIGHT = 0.7
+COST_WEIGHT = 0.3
+
+# 비용 기반 점수 계산 함수 (min-max 정규화) - 메시지당 비용 사용
+def calculate_cost_score(cost_per_message, expected_min_cost=EXPECTED_MIN_COST, expected_max_cost=EXPECTED_MAX_COST):
+    """
+    메시지당 비용을 min-max 정규화로 0~1 사이 점수로 변환 (비용이 낮을수록 높은 점수)
+    
+    Args:
+        cost_per_message: 메시지당 평균 비용
+        expected_min_cost: 예상 최소 메시지당 비용
+        expected_max_cost: 예상 최대 메시지당 비용
+    
+    Returns:
+        0~1 사이의 정규화된 점수 (비용이 낮을수록 1에 가까움)
+    """
+    if cost_per_message is None:
+        return None
+    
+    # 범위를 벗어난 값 처리
+    if cost_per_message <= expected_min_cost:
+        return 1.0
+    elif cost_per_message >= expected_max_cost:
+        return 0.0
+    
+    # min-max 정규화 (비용이 낮을수록 높은 점수)
+    return 1 - ((cost_per_message - expected_min_cost) / (expected_max_cost - expected_min_cost))
+
+# 레시피 점수와 비용 점수를 결합하는 함수
+def combine_scores(recipe_score, cost_score, recipe_weight=RECIPE_WEIGHT, cost_weight=COST_WEIGHT):
+    """
+    레시피 점수와 비용 점수를 가중치를 적용하여 결합
+    
+    Args:
+        recipe_score: 레시피 품질 평가 점수 (0~1)
+        cost_score: 비용 기반 정규화 점수 (0~1)
+        recipe_weight: 레시피 점수 가중치
+        cost_weight: 비용 점수 가중치
+    
+    Returns:
+        결합된 종합 점수 (0~1)
+    """
+    if recipe_score is None or cost_score is None:
+        return recipe_score
+    
+    return (recipe_score * recipe_weight) + (cost_score * cost_weight)
 
 async def create_experiment(db, experiment_data: dict) -> dict:
     """
@@ -8,4 +59,203 @@ async def create_experiment(db, experiment_data: dict) -> dict:
     """
     result = await db['experiments'].insert_one(experiment_data)
     experiment_data['id'] = str(result.inserted_id)
-    return experiment_data 
\ No newline at end of file
+    return experiment_data
+
+async def create_experiments_bulk(db, items: List[dict]) -> List[dict]:
+    """여러 실험 결과를 insert_many 한 번으로 저장하고 id 필드를 채워 반환합니다."""
+    if not items:
+        return items
+    result = await db['experiments'].insert_many(items)
+    for item, inserted_id in zip(items, result.inserted_ids):
+        item['id'] = str(inserted_id)
+    return items
+
+async def create_experiment_job(db, experiment_id: str, provider: str, model: str, prompt_str: str, total: int) -> dict:
+    """백그라운드 실험 작업의 진행 상황 문서를 'experiment_jobs' 컬렉션에 생성합니다."""
+    now = datetime.utcnow()
+    job = {
+        'experiment_id': experiment_id,
+        'status': 'queued',
+        'provider': provider,
+        'model': model,
+        'prompt_str': prompt_str,
+        'total': total,
+        'completed': 0,
+        'failed': 0,
+        'average_score_sum': 0.0,
+        'total_input_tokens': 0,
+        'total_output_tokens': 0,
+        'total_cost': 0.0,
+        'errors': [],
+        'created_at': now,
+        'updated_at': now,
+        'finished_at': None,
+    }
+    await db['experiment_jobs'].insert_one(job)
+    job.pop('_id', None)
+    return job
+
+async def update_experiment_job(db, experiment_id: str, fields: dict) -> None:
+    """실험 작업 문서의 필드를 갱신합니다."""
+    await db['experiment_jobs'].update_one(
+        {'experiment_id': experiment_id},
+        {'$set': {**fields, 'updated_at': datetime.utcnow()}}
+    )
+
+async def record_experiment_chunk(db, experiment_id: str, completed: int = 0, failed: int = 0,
+                                  average_score_sum: float = 0.0, input_tokens: int = 0,
+                                  output_tokens: int = 0, cost: float = 0.0, error: str | None = None) -> None:
+    """청크 하나의 처리 결과를 실험 작업 문서에 원자적으로 누적합니다."""
+    update: Dict[str, Any] = {
+        '$inc': {
+            'completed': completed,
+            'failed': failed,
+            'average_score_sum': average_score_sum,
+            'total_input_tokens': input_tokens,
+            'total_output_tokens': output_tokens,
+            'total_cost': cost,
+        },
+        '$set': {'updated_at': datetime.utcnow()},
+    }
+    if error:
+        update['$push'] = {'errors': error}
+    await db['experiment_jobs'].update_one({'experiment_id': experiment_id}, update)
+
+async def get_experiment_job(db, experiment_id: str) -> dict | None:
+    """실험 작업 진행 상황 문서를 조회합니다."""
+    return await db['experiment_jobs'].find_one({'experiment_id': experiment_id}, {'_id': 0})
+
+
+def _cost_score_expr(cost) -> dict:
+    """calculate_cost_score와 동일한 계산을 하는 집계 표현식입니다."""
+    return {"$switch": {
+        "branches": [
+            {"case": {"$eq": [{"$ifNull": [cost, None]}, None]}, "then": None},
+            {"case": {"$lte": [cost, EXPECTED_MIN_COST]}, "then": 1.0},
+            {"case": {"$gte": [cost, EXPECTED_MAX_COST]}, "then": 0.0},
+        ],
+        "default": {"$subtract": [1, {"$divide": [{"$subtract": [cost, EXPECTED_MIN_COST]}, EXPECTED_MAX_COST - EXPECTED_MIN_COST]}]},
+    }}
+
+
+def _combine_scores_expr(recipe_score, cost_score) -> dict:
+    """combine_scores와 동일한 계산을 하는 집계 표현식입니다."""
+    return {"$cond": [
+        {"$or": [{"$eq": [{"$ifNull": [recipe_score, None]}, None]}, {"$eq": [{"$ifNull": [cost_score, None]}, None]}]},
+        recipe_score,
+        {"$add": [{"$multiply": [recipe_score, RECIPE_WEIGHT]}, {"$multiply": [cost_score, COST_WEIGHT]}]},
+    ]}
+
+
+def _result_item_expr() -> dict:
+    """대화별 결과 항목 표현식 (비용 점수가 없는 이전 데이터는 개별 항목의 메시지 수를 1로 간주해 계산)."""
+    item_cost_score = {"$ifNull": ["$cost_score", _cost_score_expr("$cost")]}
+    return {
+        'conversation_id': '$conversation_id',
+        'messages': '$messages',
+        'qa_result': {"$ifNull": ['$qa_result', []]},
+        'qa_score': {"$ifNull": ['$qa_score', 0]},
+        'recipe_result': {"$ifNull": ['$recipe_result', []]},
+        'recipe_score': {"$ifNull": ['$recipe_score', 0]},
+        'average_score': {"$ifNull": ['$average_score', 0]},
+        'timestamp': '$created_at',
+        'provider': {"$ifNull": ['$provider', '-']},
+        'model': {"$ifNull": ['$model', '-']},
+        'prompt_str': {"$ifNull": ['$prompt_str', '-']},
+        'recipe_json': {"$ifNull": ['$recipe_json', None]},
+        'input_tokens': '$input_tokens',
+        'output_tokens': '$output_tokens',
+        'cost': '$cost',
+        'cost_score': item_cost_score,
+        'combined_score': {"$ifNull": [
+            '$combined_score',
+            _combine_scores_expr({"$ifNull": ['$average_score', 0]}, item_cost_score),
+        ]},
+    }
+
+
+async def _experiment_results(db, experiment_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """주어진 실험들의 대화별 결과 항목을 저장 순서대로 조회합니다. (항목마다 별도 문서로 받아 16MB 문서 한도와 무관)"""
+    results: Dict[str, List[Dict[str, Any]]] = {experiment_id: [] for experiment_id in experiment_ids}
+    if not experiment_ids:
+        return results
+    cursor = db['experiments'].aggregate([
+        {"$match": {"experiment_id": {"$in": experiment_ids}}},
+        {"$sort": {"_id": 1}},
+        {"$project": {"_id": 0, "experiment_id": 1, **_result_item_expr()}},
+    ])
+    async for item in cursor:
+        results[item.pop('experiment_id')].append(item)
+    return results
+
+
+async def list_experiment_summaries(db, skip: int = 0, limit: int = 20, include_results: bool = True) -> List[Dict[str, Any]]:
+    """
+    'experiments'를 experiment_id별로 그룹핑하고 'experiment_tokens'를 $lookup으로 결합한 실험 요약을
+    종합 점수(없으면 레시피 평균 점수) 내림차순으로 페이지 단위로 반환합니다.
+    그룹핑에는 요약 필드만 모으고, 대화별 상세 결과는 해당 페이지 실험들만 따로 조회합니다. (include_results=False면 요약만 반환)
+    """
+    group: Dict[str, Any] = {
+        "_id": "$experiment_id",
+        "overall_average": {"$avg": {"$ifNull": ["$recipe_score", 0]}},
+        "provider": {"$first": "$provider"},
+        "model": {"$first": "$model"},
+        "prompt_str": {"$first": "$prompt_str"},
+        "item_count": {"$sum": 1},
+    }
+
+    # 토큰 정보가 없는 이전 데이터의 경우 결과 수로 메시지당 비용을 추정
+    legacy_cost = {"$and": [
+        {"$ne": [{"$ifNull": ["$token.total_cost", None]}, None]},
+        {"$eq": [{"$ifNull": ["$token.avg_cost_per_message", None]}, None]},
+    ]}
+    legacy_avg_cost = {"$divide": ["$token.total_cost", {"$max": ["$item_count", 1]}]}
+
+    pipeline = [
+        {"$match": {"experiment_id": {"$type": "string", "$ne": ""}}},
+        {"$sort": {"_id": 1}},
+        {"$group": group},
+        {"$lookup": {
+            "from": "experiment_tokens",
+            "localField": "_id",
+            "foreignField": "experiment_id",
+            "as": "token",
+        }},
+        {"$set": {"token": {"$arrayElemAt": ["$token", 0]}}},
+        {"$set": {
+            "avg_cost_per_message": {"$cond": [legacy_cost, legacy_avg_cost, "$token.avg_cost_per_message"]},
+            "cost_score": {"$cond": [legacy_cost, _cost_score_expr(legacy_avg_cost), "$token.cost_score"]},
+        }},
+        {"$set": {
+            "combined_score": {"$cond": [
+                legacy_cost, _combine_scores_expr("$overall_average", "$cost_score"), "$token.combined_score",
+            ]},
+        }},
+        {"$set": {"sort_score": {"$ifNull": ["$combined_score", "$overall_average"]}}},
+        {"$sort": {"sort_score": -1, "_id": 1}},
+        {"$skip": skip},
+        {"$limit": limit},
+    ]
+    docs = await db['experiments'].aggregate(pipeline, allowDiskUse=True).to_list(length=limit)
+    results = await _experiment_results(db, [doc['_id'] for doc in docs]) if include_results else {}
+
+    summaries: List[Dict[str, Any]] = []
+    for doc in docs:
+        token = doc.get('token') or {}
+        summaries.append({
+            'experiment_id': doc['_id'],
+            'overall_average': doc.get('overall_average') or 0.0,
+            'provider': doc.get('provider') or '-',
+            'model': doc.get('model') or '-',
+            'prompt_str': doc.get('prompt_str') or '-',
+            'results': results.get(doc['_id'], []),
+            'total_input_tokens': token.get('total_input_tokens'),
+            'total_output_tokens': token.get('total_output_tokens'),
+            'total_cost': token.get('total_cost'),
+            'avg_cost_per_message': doc.get('avg_cost_per_message'),
+            'cost_score': doc.get('cost_score'),
+            'combined_score': doc.get('combined_score'),
+            'duration': token.get('duration'),
+            'time_per_message': token.get('time_per_message'),
+        })
+    return summaries
@@ -1,41 +1,288 @@
 from bson import ObjectId
-from datetime import datetime
+from bson.errors import InvalidId
+from datetime import datetime, timedelta
+import base64
+import copy
+from pydantic import TypeAdapter
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from core.config import settings
 from db.mongo import get_collection
+from utils.cache import TTLCache
+from utils.etag import make_etag
+from schemas.recipe import Recipe
+from crud.recipe_stats import apply_recipe_stats_delta, reset_recipe_stats
+from utils.recipe_indexes import index_recipes, clear_recipe_indexes
+from utils.recommender import recipe_recommender
+from utils.allergen_filter import allergen_filter, recipe_allergen_terms, exclusion_words
+from utils.recipe_dedup import recipe_dedup
+from utils.recipe_search import recipe_search_index
 
 BOOKMARK_COLLECTION = "bookmarks"
 
+# 레시피 목록 페이지 크기 기본값/최대값
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# 카드 형태 목록에 필요한 레시피 필드만 조회하기 위한 projection
+RECIPE_CARD_PROJECTION = {
+    'title': 1, 'description': 1, 'image': 1, 'difficulty': 1, 'cookTime': 1,
+    'rating': 1, 'category': 1, 'suitableBodyTypes': 1, 'tags': 1,
+}
+
+# 수정되면 allergenTerms를 다시 계산해야 하는 필드
+ALLERGEN_SOURCE_FIELDS = ('ingredients', 'keyIngredients')
+
+# ETag 계산에 쓰는 레시피 버전 필드 (version은 수정마다 $inc, 이전 문서는 lastEditedAt으로 구분)
+RECIPE_VERSION_FIELDS = ('version', 'lastEditedAt', 'bookmarkCount')
+
+# get_recipe_by_id 앞단의 프로세스 내 읽기 캐시 (recipe_id -> 문서)
+# 쓰기 경로에서 무효화하며, 다른 워커 프로세스의 수정은 TTL이 지나면 반영됩니다.
+recipe_cache = TTLCache(maxsize=settings.RECIPE_CACHE_MAXSIZE, ttl=settings.RECIPE_CACHE_TTL)
+
+_recipe_list_adapter = TypeAdapter(list[Recipe])
+
 async def create_recipe(db, recipe_data: dict) -> dict:
-    """MongoDB 'recipes' 컬렉션에 레시피를 저장하고, id 필드를 문자열로 변환해 반환합니다."""
+    """
+    MongoDB 'recipes' 컬렉션에 레시피를 저장하고, id 필드를 문자열로 변환해 반환합니다.
+    이미 저장된 레시피와 같거나 거의 같으면 새로 저장하지 않고 기존 레시피를 반환합니다.
+    """
     # 클라이언트로부터 들어온 id 필드 제거
     recipe_data.pop('id', None)
+    duplicate_id = recipe_dedup.check_and_record(recipe_data)
+    if duplicate_id:
+        existing = await get_recipe_by_id(db, duplicate_id)
+        if existing:
+            return existing
+    recipe_data['bookmarkCount'] = 0
+    recipe_data['version'] = 1
+    recipe_data['allergenTerms'] = recipe_allergen_terms(recipe_data)
     result = await db['recipes'].insert_one(recipe_data)
     recipe_data['id'] = str(result.inserted_id)
+    recipe_cache.invalidate(recipe_data['id'])
+    await apply_recipe_stats_delta(db, added=[recipe_data])
+    index_recipes([recipe_data])
     return recipe_data
 
+def validate_recipes(recipes: list[dict]) -> list[dict]:
+    """레시피 dict 리스트를 Recipe 스키마로 한 번에 검증하고, 기본값이 채워진 dict 리스트로 반환합니다."""
+    return [recipe.model_dump() for recipe in _recipe_list_adapter.validate_python(recipes)]
+
+async def create_recipes_bulk(db, recipes: list[dict], validate: bool = True) -> list[dict]:
+    """
+    여러 레시피를 검증한 뒤 insert_many 한 번으로 저장하고, id 필드를 채운 문서 리스트를 반환합니다.
+    이미 검증된 데이터(예: Recipe 모델의 model_dump 결과)는 validate=False로 재검증을 생략할 수 있습니다.
+    검증 실패 시 pydantic.ValidationError를 발생시키며, 이 경우 아무것도 저장하지 않습니다.
+    이미 저장된 레시피와 중복되는 항목은 저장하지 않고 기존 레시피를 결과에 포함합니다.
+    """
+    docs = validate_recipes(recipes) if validate else [dict(recipe) for recipe in recipes]
+    docs, duplicate_ids = recipe_dedup.partition(docs)
+    existing = await get_recipes_by_ids(db, duplicate_ids) if duplicate_ids else []
+    if not docs:
+        return existing
+    for doc in docs:
+        doc.pop('id', None)
+        doc['bookmarkCount'] = 0
+        doc['version'] = 1
+        doc['allergenTerms'] = recipe_allergen_terms(doc)
+    result = await db['recipes'].insert_many(docs)
+    for doc, inserted_id in zip(docs, result.inserted_ids):
+        doc['id'] = str(inserted_id)
+    await apply_recipe_stats_delta(db, added=docs)
+    index_recipes(docs)
+    return docs + existing
+
 async def get_recipe_by_id(db, recipe_id: str) -> dict | None:
-    """주어진 ID의 레시피를 조회하여 id 필드를 문자열로 변환해 반환합니다."""
+    """주어진 ID의 레시피를 조회하여 id 필드를 문자열로 변환해 반환합니다. 캐시에 있으면 DB를 조회하지 않습니다."""
+    cached = recipe_cache.get(recipe_id)
+    if cached is not None:
+        return copy.deepcopy(cached)
     doc = await db['recipes'].find_one({'_id': ObjectId(recipe_id)})
     if not doc:
         return None
     doc['id'] = str(doc['_id'])
+    recipe_cache.set(recipe_id, copy.deepcopy(doc))
     return doc
 
-async def add_bookmark(user_id: str, recipe_id: str):
+def recipe_etag(doc: dict) -> str:
+    """레시피 문서의 버전 필드로 ETag를 만듭니다. 북마크 수도 응답 본문에 포함되므로 함께 반영합니다."""
+    return make_etag('recipe', doc['_id'], *(doc.get(field) for field in RECIPE_VERSION_FIELDS))
+
+async def get_recipe_etag(db, recipe_id: str) -> str | None:
+    """
+    레시피 본문을 만들지 않고 ETag만 계산합니다. 버전 필드만 MongoDB에서 조회합니다.
+    recipe_cache는 워커 프로세스마다 따로 있어 다른 워커의 수정을 모르므로, 304 판단(최신 여부)에는 쓰지 않습니다.
+    """
+    doc = await db['recipes'].find_one(
+        {'_id': ObjectId(recipe_id)}, {field: 1 for field in RECIPE_VERSION_FIELDS}
+    )
+    return recipe_etag(doc) if doc else None
+
+async def get_recipes_by_ids(db, recipe_ids: list[str], projection: dict | None = None,
+                             query_filter: dict | None = None) -> list[dict]:
+    """주어진 id 목록의 레시피를 $in 한 번으로 조회해 id 목록 순서대로 반환합니다. query_filter에 걸리지 않는 레시피는 빠집니다."""
+    object_ids = [ObjectId(rid) for rid in recipe_ids if ObjectId.is_valid(rid)]
+    if not object_ids:
+        return []
+    query = {**(query_filter or {}), '_id': {'$in': object_ids}}
+    docs = await db['recipes'].find(query, projection).to_list(length=len(object_ids))
+    by_id = {}
+    for doc in docs:
+        doc['id'] = str(doc['_id'])
+        by_id[doc['id']] = doc
+    return [by_id[rid] for rid in recipe_ids if rid in by_id]
+
+async def get_recommended_recipes(db, profile: dict, limit: int = DEFAULT_PAGE_SIZE,
+                                  allergies: list[str] | None = None,
+                                  dietary_restrictions: list[str] | None = None) -> list[dict]:
+    """
+    사용자 프로필(constitution, allergies, health_goals)을 메모리 역색인으로 점수화해 추천 레시피를 반환합니다.
+    프로필의 알레르기에 요청으로 받은 알레르기/식이 제한을 더해 비트셋 필터로 제외하고,
+    조회할 때 문서의 allergenTerms로 한 번 더 걸러 아직 비트셋에 반영되지 않은 수정도 놓치지 않습니다.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    allergies = [*(profile.get('allergies') or []), *(allergies or [])]
+    excluded = allergen_filter.excluded_ids(allergies, dietary_restrictions or [])
+    recipe_ids = recipe_recommender.recommend(
+        constitution=profile.get('constitution'),
+        health_goals=profile.get('health_goals') or [],
+        excluded_ids=excluded,
+        limit=limit,
+    )
+    return await get_recipes_by_ids(db, recipe_ids, query_filter=build_exclusion_filter(allergies, dietary_restrictions))
+
+async def search_recipes(db, query: str, category: str | None = None, difficulty: str | None = None,
+                         constitution: str | None = None, allergies: list[str] | None = None,
+                         dietary_restrictions: list[str] | None = None,
+                         limit: int = DEFAULT_PAGE_SIZE) -> list[dict]:
+    """title/description/ingredients/tags 전문 검색 결과를 BM25 점수 순으로 반환합니다. (메모리 bigram 역색인 사용)"""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    excluded = allergen_filter.excluded_ids(allergies or [], dietary_restrictions or []) \
+        if allergies or dietary_restrictions else None
+    recipe_ids = recipe_search_index.search(
+        query, category=category, difficulty=difficulty, constitution=constitution,
+        excluded_ids=excluded, limit=limit,
+    )
+    return await get_recipes_by_ids(db, recipe_ids, query_filter=build_exclusion_filter(allergies, dietary_restrictions))
+
+async def delete_all_recipes(db) -> int:
+    """'recipes' 컬렉션의 모든 레시피를 삭제하고 캐시를 비운 뒤 삭제된 개수를 반환합니다."""
+    result = await db['recipes'].delete_many({})
+    recipe_cache.clear()
+    clear_recipe_indexes()
+    await reset_recipe_stats(db)
+    return result.deleted_count
+
+def encode_cursor(last_id: ObjectId) -> str:
+    """마지막으로 반환한 문서의 _id를 클라이언트용 불투명 커서 문자열로 인코딩합니다."""
+    return base64.urlsafe_b64encode(last_id.binary).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> ObjectId:
+    """encode_cursor로 만든 커서를 _id로 복원합니다. 잘못된 커서는 ValueError를 발생시킵니다."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        return ObjectId(raw)
+    except (ValueError, TypeError, InvalidId):
+        raise ValueError("잘못된 커서입니다.")
+
+def build_recipe_filter(
+    category: str | None = None,
+    difficulty: str | None = None,
+    suitable_body_types: list[str] | None = None,
+    key_ingredients: list[str] | None = None,
+) -> dict:
+    """레시피 목록 조회용 MongoDB 필터를 생성합니다. 리스트 필터는 모든 값을 포함하는 레시피만 남깁니다."""
+    query: dict = {}
+    if category:
+        query['category'] = category
+    if difficulty:
+        query['difficulty'] = difficulty
+    if suitable_body_types:
+        query['suitableBodyTypes'] = {'$all': suitable_body_types}
+    if key_ingredients:
+        query['keyIngredients'] = {'$all': key_ingredients}
+    return query
+
+def build_exclusion_filter(allergies: list[str] | None = None, dietary_restrictions: list[str] | None = None) -> dict:
+    """
+    알레르기/식이 제한에 걸리는 레시피를 제외하는 MongoDB 필터를 레시피 문서의 allergenTerms로 만듭니다.
+    allergenTerms에는 재료 이름과 해당하는 알레르기 단어가 풀어 저장되어 있으므로 제외 단어를 $nin으로 정확히 비교하며,
+    allergenTerms가 아직 없는(백필 전) 레시피는 판단할 수 없으므로 제외합니다. (python -m db.migrations)
+    """
+    words = exclusion_words(allergies or [], dietary_restrictions or [])
+    if not words:
+        return {}
+    return {'allergenTerms': {'$exists': True, '$nin': sorted(words)}}
+
+async def list_recipes_page(db, filters: dict | None = None, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE) -> dict:
+    """
+    _id 기준 keyset 페이지네이션으로 레시피 목록을 조회합니다.
+    최신 레시피부터 반환하며, 다음 페이지가 있으면 next_cursor를 함께 돌려줍니다.
+    skip을 사용하지 않으므로 컬렉션 크기와 무관하게 페이지 조회 비용이 일정합니다.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query = dict(filters or {})
+    if cursor:
+        query['_id'] = {**query.get('_id', {}), '$lt': decode_cursor(cursor)}
+    # 다음 페이지 존재 여부 확인을 위해 1개 더 조회
+    docs = await db['recipes'].find(query).sort('_id', -1).limit(limit + 1).to_list(length=limit + 1)
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+    for doc in docs:
+        doc['id'] = str(doc['_id'])
+    next_cursor = encode_cursor(docs[-1]['_id']) if has_more else None
+    return {"items": docs, "next_cursor": next_cursor}
+
+async def _inc_bookmark_count(recipe_db, recipe_id: str, amount: int) -> None:
+    """레시피 문서의 bookmarkCount 인기 카운터를 원자적으로 증감합니다."""
+    if not ObjectId.is_valid(recipe_id):
+        return
+    await recipe_db['recipes'].update_one(
+        {'_id': ObjectId(recipe_id)},
+        {'$inc': {'bookmarkCount': amount}, '$set': {'updatedAt': datetime.utcnow()}},
+    )
+    recipe_cache.invalidate(recipe_id)
+
+async def add_bookmark(user_id: str, recipe_id: str, recipe_db):
+    """
+    북마크를 추가합니다. 이미 북마크한 레시피면 기존 북마크를 반환하며 카운터는 새로 추가된 경우에만 증가합니다.
+    (user_id, recipe_id) 고유 인덱스로 동시 요청의 중복 upsert를 막고, 이때의 DuplicateKeyError는 이미 북마크한 것으로 처리합니다.
+    """
     collection = get_collection(BOOKMARK_COLLECTION)
-    bookmark = {
-        "user_id": user_id,
-        "recipe_id": recipe_id,
-        "created_at": datetime.utcnow(),
-    }
-    result = await collection.insert_one(bookmark)
-    bookmark["id"] = str(result.inserted_id)
+    key = {"user_id": user_id, "recipe_id": recipe_id}
+    try:
+        result = await collection.update_one(
+            key,
+            {"$setOnInsert": {**key, "created_at": datetime.utcnow()}},
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        result = None
+    if result is not None and result.upserted_id is not None:
+        await _inc_bookmark_count(recipe_db, recipe_id, 1)
+    bookmark = await collection.find_one(key)
+    bookmark["id"] = str(bookmark["_id"])
     return bookmark
 
-async def remove_bookmark(user_id: str, recipe_id: str):
+async def remove_bookmark(user_id: str, recipe_id: str, recipe_db):
     collection = get_collection(BOOKMARK_COLLECTION)
     result = await collection.delete_one({"user_id": user_id, "recipe_id": recipe_id})
+    if result.deleted_count:
+        await _inc_bookmark_count(recipe_db, recipe_id, -result.deleted_count)
     return {"deleted": result.deleted_count}
 
+async def get_popular_recipes(db, limit: int = DEFAULT_PAGE_SIZE, constitution: str | None = None,
+                              exclusion_filter: dict | None = None) -> list[dict]:
+    """bookmarkCount 내림차순으로 인기 레시피를 조회합니다. (bookmarkCount 정렬 인덱스를 사용하는 단일 조회)"""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query: dict = dict(exclusion_filter or {})
+    if constitution:
+        query['suitableBodyTypes'] = constitution
+    docs = await db['recipes'].find(query).sort([('bookmarkCount', -1), ('_id', -1)]).limit(limit).to_list(length=limit)
+    for doc in docs:
+        doc['id'] = str(doc['_id'])
+    return docs
+
 async def get_user_bookmarks(user_id: str):
     collection = get_collection(BOOKMARK_COLLECTION)
     bookmarks = await collection.find({"user_id": user_id}).to_list(length=1000)
@@ -43,6 +290,62 @@ async def get_user_bookmarks(user_id: str):
         b["id"] = str(b["_id"])
     return bookmarks
 
+_EPOCH = datetime(1970, 1, 1)
+
+def encode_bookmark_cursor(created_at: datetime, bookmark_id: ObjectId) -> str:
+    """북마크 keyset 커서: (created_at 밀리초, _id)를 불투명 문자열로 인코딩합니다."""
+    millis = (created_at.replace(tzinfo=None) - _EPOCH) // timedelta(milliseconds=1)
+    return base64.urlsafe_b64encode(f"{millis}:{bookmark_id}".encode()).decode().rstrip("=")
+
+def decode_bookmark_cursor(cursor: str) -> tuple[datetime, ObjectId]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        millis, bookmark_id = raw.split(":", 1)
+        return _EPOCH + timedelta(milliseconds=int(millis)), ObjectId(bookmark_id)
+    except (ValueError, TypeError, InvalidId):
+        raise ValueError("잘못된 커서입니다.")
+
+async def get_user_bookmarked_recipes(recipe_db, user_id: str, cursor: str | None = None,
+                                      limit: int = DEFAULT_PAGE_SIZE, card: bool = False) -> dict:
+    """
+    사용자의 북마크를 최신순(created_at, _id)으로 keyset 페이지네이션하고, 북마크된 레시피를 함께 반환합니다.
+    북마크(사용자 DB)와 레시피(레시피 DB)는 서로 다른 데이터베이스라 $lookup 대신 페이지당 한 번의 $in 조회로 결합합니다.
+    card=True이면 카드 표시용 필드만 조회합니다.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query: dict = {"user_id": user_id}
+    if cursor:
+        created_at, bookmark_id = decode_bookmark_cursor(cursor)
+        query["$or"] = [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": bookmark_id}},
+        ]
+    bookmarks = await get_collection(BOOKMARK_COLLECTION).find(query).sort(
+        [("created_at", -1), ("_id", -1)]
+    ).limit(limit + 1).to_list(length=limit + 1)
+    has_more = len(bookmarks) > limit
+    bookmarks = bookmarks[:limit]
+
+    recipe_ids = [ObjectId(b["recipe_id"]) for b in bookmarks if ObjectId.is_valid(b["recipe_id"])]
+    projection = RECIPE_CARD_PROJECTION if card else None
+    recipes = await recipe_db['recipes'].find({'_id': {'$in': recipe_ids}}, projection).to_list(length=len(recipe_ids))
+    recipe_map = {}
+    for recipe in recipes:
+        recipe['id'] = str(recipe.pop('_id'))
+        recipe_map[recipe['id']] = recipe
+
+    items = [
+        {
+            "bookmark_id": str(b["_id"]),
+            "recipe_id": b["recipe_id"],
+            "created_at": b.get("created_at"),
+            "recipe": recipe_map.get(b["recipe_id"]),
+        }
+        for b in bookmarks
+    ]
+    next_cursor = encode_bookmark_cursor(bookmarks[-1]["created_at"], bookmarks[-1]["_id"]) if has_more else None
+    return {"items": items, "next_cursor": next_cursor}
+
 async def update_recipe(db, recipe_id: str, update_data: dict) -> dict:
     """주어진 ID의 레시피를 수정하고 수정 사유를 저장한 후, 수정된 레시피를 반환합니다."""
     reason = update_data.pop('editReason', None)
@@ -51,7 +354,33 @@ async def update_recipe(db, recipe_id: str, update_data: dict) -> dict:
         update_set['lastEditReason'] = reason
         update_set['lastEditedAt'] = datetime.utcnow()
     if update_set:
-        await db['recipes'].update_one({'_id': ObjectId(recipe_id)}, {'$set': update_set})
-    doc = await db['recipes'].find_one({'_id': ObjectId(recipe_id)})
+        update_set.pop('allergenTerms', None)
+        # 다른 워커의 메모리 인덱스가 증분 갱신으로 이 수정을 읽어 가도록 표시
+        update_set['updatedAt'] = datetime.utcnow()
+        update: dict = {'$set': update_set, '$inc': {'version': 1}}
+        refresh_terms = any(field in update_set for field in ALLERGEN_SOURCE_FIELDS)
+        if refresh_terms:
+            # 다시 계산할 때까지 알레르기 제외 필터가 이 레시피를 걸러내도록 먼저 제거
+            update['$unset'] = {'allergenTerms': ''}
+        # 수정 전 문서를 받아 통계 증감 계산에 사용하고, 수정 후 문서는 메모리에서 구성
+        before = await db['recipes'].find_one_and_update(
+            {'_id': ObjectId(recipe_id)}, update, return_document=ReturnDocument.BEFORE,
+        )
+        doc = {**before, **update_set, 'version': before.get('version', 0) + 1} if before else None
+        if before:
+            if refresh_terms:
+                doc['allergenTerms'] = recipe_allergen_terms(doc)
+                # 그 사이 다른 수정이 있었다면 그 수정이 다시 계산하므로 같은 버전일 때만 저장
+                await db['recipes'].update_one(
+                    {'_id': before['_id'], 'version': doc['version']},
+                    {'$set': {'allergenTerms': doc['allergenTerms']}},
+                )
+            await apply_recipe_stats_delta(db, removed=[before], added=[doc])
+    else:
+        doc = await db['recipes'].find_one({'_id': ObjectId(recipe_id)})
+    recipe_cache.invalidate(recipe_id)
+    if not doc:
+        return None
     doc['id'] = str(doc['_id'])
+    index_recipes([doc])
     return doc 
\ No newline at end of file
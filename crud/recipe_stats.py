@@ -1,47 +1,127 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable
+from collections import Counter
+from pymongo import UpdateOne
+from db.indexes import INDEXES
 
-async def generate_recipe_stats(db) -> List[Dict[str, Any]]:
+STATS_COLLECTION = 'recipe_stats'
+# 전체 재계산 결과를 먼저 기록한 뒤 rename으로 교체하는 임시 컬렉션
+STATS_SHADOW_COLLECTION = 'recipe_stats_rebuild'
+# 통계가 바뀔 때마다 증가하는 스냅샷 버전 (GET /stats/ 의 ETag에 사용)
+STATS_META_COLLECTION = 'recipe_stats_meta'
+STATS_SNAPSHOT_ID = 'snapshot'
+
+
+def recipe_stat_keys(doc: dict) -> List[tuple]:
+    """레시피 한 건이 기여하는 (dimension, value) 통계 키 목록을 반환합니다."""
+    keys = []
+    if doc.get('category') is not None:
+        keys.append(('category', doc['category']))
+    if doc.get('difficulty') is not None:
+        keys.append(('difficulty', doc['difficulty']))
+    for body_type in set(doc.get('suitableBodyTypes') or []):
+        keys.append(('constitution', body_type))
+    for ingredient in set(doc.get('keyIngredients') or []):
+        keys.append(('ingredient', ingredient))
+    return keys
+
+
+async def apply_recipe_stats_delta(db, removed: Iterable[dict] = (), added: Iterable[dict] = ()) -> None:
     """
-    레시피 컬렉션을 기반으로 category, difficulty, constitution, mainIngredient별 통계를 생성하여 'recipe_stats' 컬렉션에 저장합니다.
+    레시피 생성/수정/삭제 시 변경된 통계 키만 $inc upsert로 갱신합니다.
+    수정의 경우 이전 문서를 removed, 수정된 문서를 added로 넘깁니다.
     """
-    recipes_col = db['recipes']
-    stats_col = db['recipe_stats']
-    results: List[Dict[str, Any]] = []
+    delta: Counter = Counter()
+    for doc in removed:
+        for key in recipe_stat_keys(doc):
+            delta[key] -= 1
+    for doc in added:
+        for key in recipe_stat_keys(doc):
+            delta[key] += 1
+    ops = [
+        UpdateOne({'dimension': dimension, 'value': value}, {'$inc': {'count': count}}, upsert=True)
+        for (dimension, value), count in delta.items() if count
+    ]
+    if not ops:
+        return
+    stats_col = db[STATS_COLLECTION]
+    await stats_col.bulk_write(ops, ordered=False)
+    if any(count < 0 for count in delta.values()):
+        await stats_col.delete_many({'count': {'$lte': 0}})
+    await _bump_stats_version(db)
 
-    # 카테고리별 집계
-    pipeline = [{"$group": {"_id": "$category", "count": {"$sum": 1}}}]
-    async for doc in recipes_col.aggregate(pipeline):
-        results.append({"dimension": "category", "value": doc["_id"], "count": doc["count"]})
 
-    # 난이도별 집계
-    pipeline = [{"$group": {"_id": "$difficulty", "count": {"$sum": 1}}}]
-    async for doc in recipes_col.aggregate(pipeline):
-        results.append({"dimension": "difficulty", "value": doc["_id"], "count": doc["count"]})
+async def reset_recipe_stats(db) -> None:
+    """모든 레시피가 삭제되었을 때 통계를 비웁니다."""
+    await db[STATS_COLLECTION].delete_many({})
+    await _bump_stats_version(db)
 
-    # 체질별 집계 (suitableBodyTypes 리스트 언와인드)
-    pipeline = [
-        {"$unwind": "$suitableBodyTypes"},
-        {"$group": {"_id": "$suitableBodyTypes", "count": {"$sum": 1}}}
+
+async def _bump_stats_version(db) -> None:
+    await db[STATS_META_COLLECTION].update_one({'_id': STATS_SNAPSHOT_ID}, {'$inc': {'version': 1}}, upsert=True)
+
+
+async def get_recipe_stats_version(db) -> int:
+    """통계 스냅샷 버전을 반환합니다. 통계 본문을 읽지 않고 변경 여부를 판단할 때 사용합니다."""
+    doc = await db[STATS_META_COLLECTION].find_one({'_id': STATS_SNAPSHOT_ID}, {'version': 1})
+    return doc.get('version', 0) if doc else 0
+
+
+def _unique_values(field: str) -> List[Dict[str, Any]]:
+    """배열 필드를 문서당 중복 없이 펼쳐 값별로 집계하는 $facet 하위 파이프라인입니다."""
+    return [
+        {"$project": {"v": {"$setUnion": [{"$ifNull": [f"${field}", []]}, []]}}},
+        {"$unwind": "$v"},
+        {"$group": {"_id": "$v", "count": {"$sum": 1}}},
     ]
-    async for doc in recipes_col.aggregate(pipeline):
-        results.append({"dimension": "constitution", "value": doc["_id"], "count": doc["count"]})
 
-    # 주요 재료별 집계 (mainIngredient 필드 가정)
-    pipeline = [{"$group": {"_id": "$mainIngredient", "count": {"$sum": 1}}}]
-    async for doc in recipes_col.aggregate(pipeline):
-        results.append({"dimension": "ingredient", "value": doc["_id"], "count": doc["count"]})
 
-    # 기존 통계 문서 삭제 후 재삽입
-    await stats_col.delete_many({})
-    if results:
-        await stats_col.insert_many(results)
+def _as_rows(dimension: str) -> Dict[str, Any]:
+    return {"$map": {"input": f"${dimension}", "in": {"dimension": dimension, "value": "$$this._id", "count": "$$this.count"}}}
+
+
+async def generate_recipe_stats(db) -> List[Dict[str, Any]]:
+    """
+    레시피 컬렉션 전체를 단일 $facet 파이프라인으로 집계해 통계를 재계산합니다.
+    결과는 임시 컬렉션에 $out으로 기록한 뒤 rename으로 교체하므로, 재계산 중에도 기존 통계를 계속 조회할 수 있습니다.
+    평소에는 apply_recipe_stats_delta가 쓰기 시점에 통계를 갱신하므로 데이터 보정이 필요할 때만 사용합니다.
+    """
+    pipeline = [
+        {"$facet": {
+            "category": [
+                {"$match": {"category": {"$ne": None}}},
+                {"$group": {"_id": "$category", "count": {"$sum": 1}}},
+            ],
+            "difficulty": [
+                {"$match": {"difficulty": {"$ne": None}}},
+                {"$group": {"_id": "$difficulty", "count": {"$sum": 1}}},
+            ],
+            "constitution": _unique_values("suitableBodyTypes"),
+            "ingredient": _unique_values("keyIngredients"),
+        }},
+        {"$project": {"rows": {"$concatArrays": [
+            _as_rows("category"), _as_rows("difficulty"), _as_rows("constitution"), _as_rows("ingredient"),
+        ]}}},
+        {"$unwind": "$rows"},
+        {"$replaceRoot": {"newRoot": "$rows"}},
+        {"$out": STATS_SHADOW_COLLECTION},
+    ]
+    await db['recipes'].aggregate(pipeline).to_list(length=None)
+
+    shadow_names = await db.list_collection_names(filter={"name": STATS_SHADOW_COLLECTION})
+    if not shadow_names:
+        # 레시피가 하나도 없으면 $out 결과 컬렉션이 생성되지 않을 수 있음
+        await reset_recipe_stats(db)
+        return []
+    await db[STATS_SHADOW_COLLECTION].create_indexes(INDEXES['recipe'][STATS_COLLECTION])
+    await db[STATS_SHADOW_COLLECTION].rename(STATS_COLLECTION, dropTarget=True)
+    await _bump_stats_version(db)
+    return await get_recipe_stats(db)
 
-    return results
 
 async def get_recipe_stats(db) -> List[Dict[str, Any]]:
     """
     저장된 'recipe_stats' 컬렉션에서 모든 통계를 조회하여 반환합니다.
     """
-    stats_col = db['recipe_stats']
+    stats_col = db[STATS_COLLECTION]
     docs = await stats_col.find().to_list(length=1000)
-    return [{"dimension": doc["dimension"], "value": doc["value"], "count": doc["count"]} for doc in docs] 
\ No newline at end of file
+    return [{"dimension": doc["dimension"], "value": doc["value"], "count": doc["count"]} for doc in docs]
@@ -0,0 +1,92 @@
+from typing import List, Dict, Any
+from datetime import datetime
+from pymongo import ASCENDING
+
+# 미리 생성해 둔(아직 제공하지 않은) 자동 생성 레시피 재고
+STOCK_COLLECTION = 'recipe_stock'
+# 칸별 수요 집계 (요청 수, 재고 적중/부족, 소진 속도, 최근 요청의 주요 재료)
+STOCK_CELLS_COLLECTION = 'recipe_stock_cells'
+# 칸별로 기억할 최근 요청의 주요 재료 목록 수 (재고 보충 시 어떤 재료로 생성할지 정하는 데 사용)
+RECENT_KEY_INGREDIENTS = 50
+
+
+def stock_cell(payload: dict) -> Dict[str, Any]:
+    """자동 생성 요청에서 재고 칸(체질, 카테고리, 난이도)을 추출합니다. 지정하지 않은 항목은 None 칸입니다."""
+    def norm(value):
+        return value.strip() if isinstance(value, str) and value.strip() else None
+    return {
+        'constitution': norm(payload.get('constitution')),
+        'category': norm(payload.get('category')),
+        'difficulty': norm(payload.get('difficulty')),
+    }
+
+
+def _cell_id(cell: dict) -> str:
+    return '|'.join(cell.get(key) or '' for key in ('constitution', 'category', 'difficulty'))
+
+
+async def take_recipe_stock(db, payload: dict) -> List[dict] | None:
+    """
+    요청 칸의 재고 중 가장 오래된 것을 find_one_and_delete로 꺼내 레시피 리스트(저장 전)를 반환합니다.
+    재고가 없으면 None을 반환합니다. 주요 재료를 지정한 요청은 같은 칸에서 해당 재료를 모두 포함한 재고만 사용합니다.
+    칸별 수요(요청 수, 적중/부족)와 요청의 주요 재료도 함께 기록해 재고 보충량과 보충할 재료 계산에 사용합니다.
+    """
+    cell = stock_cell(payload)
+    query = dict(cell)
+    key_ingredients = sorted({i for i in payload.get('keyIngredients') or [] if i})
+    if key_ingredients:
+        query['keyIngredients'] = {'$all': key_ingredients}
+    stock = await db[STOCK_COLLECTION].find_one_and_delete(query, sort=[('created_at', ASCENDING)])
+    await db[STOCK_CELLS_COLLECTION].update_one(
+        {'_id': _cell_id(cell)},
+        {
+            '$inc': {'requests': 1, 'window_requests': 1, 'hits' if stock else 'misses': 1},
+            '$set': {'last_requested_at': datetime.utcnow()},
+            '$setOnInsert': {**cell, 'rate': 0.0},
+            # 재료를 지정하지 않은 요청은 빈 목록으로 기록해 재료 없는 재고 수요도 반영
+            '$push': {'recent_key_ingredients': {'$each': [key_ingredients], '$slice': -RECENT_KEY_INGREDIENTS}},
+        },
+        upsert=True,
+    )
+    return stock['recipes'] if stock else None
+
+
+async def add_recipe_stock(db, cell: dict, recipes: List[dict], key_ingredients: List[str] | None = None) -> None:
+    """
+    검증된 레시피 리스트(한 번의 생성 결과)를 칸의 재고로 추가합니다.
+    key_ingredients는 생성 요청에 지정한 주요 재료로, 레시피의 keyIngredients 표기가 달라도 같은 재료 요청이 이 재고를 꺼낼 수 있게 합니다.
+    """
+    if not recipes:
+        return
+    key_ingredients = sorted({i for recipe in recipes for i in recipe.get('keyIngredients') or []} | set(key_ingredients or []))
+    await db[STOCK_COLLECTION].insert_one({
+        **cell,
+        'keyIngredients': key_ingredients,
+        'recipes': recipes,
+        'created_at': datetime.utcnow(),
+    })
+
+
+async def roll_stock_demand(db, alpha: float) -> List[Dict[str, Any]]:
+    """
+    칸별 소진 속도(rate, 보충 주기당 요청 수의 지수이동평균)를 갱신하고 window_requests를 초기화한 뒤,
+    칸 목록과 현재 재고 수를 함께 반환합니다.
+    """
+    await db[STOCK_CELLS_COLLECTION].update_many({}, [
+        {'$set': {
+            'rate': {'$add': [
+                {'$multiply': [alpha, {'$ifNull': ['$window_requests', 0]}]},
+                {'$multiply': [1 - alpha, {'$ifNull': ['$rate', 0]}]},
+            ]},
+            'window_requests': 0,
+        }},
+    ])
+    cells = await db[STOCK_CELLS_COLLECTION].find().to_list(length=None)
+    levels = await db[STOCK_COLLECTION].aggregate([
+        {'$group': {
+            '_id': {'constitution': '$constitution', 'category': '$category', 'difficulty': '$difficulty'},
+            'count': {'$sum': 1},
+        }},
+    ]).to_list(length=None)
+    stock_counts = {_cell_id(level['_id']): level['count'] for level in levels}
+    return [{**cell, 'stock': stock_counts.get(cell['_id'], 0)} for cell in cells]
@@ -37,6 +37,10 @@ async def get_user_by_email(db, email: str):
 from fastapi.security import OAuth2PasswordBearer, APIKeyHeader
 from jose import JWTError, jwt
 from fastapi import HTTPException, Depends
+import hashlib
+import time
+from core.config import settings
+from utils.cache import TTLCache
 
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl="/api/v1/users/login",
@@ -45,10 +49,30 @@ oauth2_scheme = OAuth2PasswordBearer(
 # oauth2_scheme2 = OAuth2PasswordBearer(tokenUrl="/api/v1/users/login")
 # oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/users/token")
 
+# 검증이 끝난 토큰의 payload 캐시 (토큰 SHA-256 digest -> payload)
+# 각 항목은 토큰의 exp 시각까지만 유지되며, exp가 없는 토큰은 기본 TTL을 사용합니다.
+token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_MAXSIZE, ttl=settings.TOKEN_CACHE_DEFAULT_TTL)
+
+def decode_access_token(token: str) -> dict:
+    """JWT를 검증해 payload를 반환합니다. 이미 검증한 토큰은 만료 전까지 캐시된 payload를 재사용합니다."""
+    key = hashlib.sha256(token.encode()).digest()
+    now = time.time()
+    payload = token_cache.get(key)
+    if payload is not None:
+        exp = payload.get("exp")
+        if exp is None or exp > now:
+            return payload
+        # 만료된 토큰은 캐시에서 제거하고 다시 검증 (jwt.decode가 만료 오류를 발생시킴)
+        token_cache.invalidate(key)
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    exp = payload.get("exp")
+    token_cache.set(key, payload, ttl=(exp - now) if exp is not None else None)
+    return payload
+
 # 현재 사용자 정보 추출 함수
 async def get_current_user(token: str = Depends(oauth2_scheme)):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_access_token(token)
         user_id: str = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid token")
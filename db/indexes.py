@@ -0,0 +1,143 @@
+# db/indexes.py -- 컬렉션별 인덱스 선언 및 적용
+# 각 컬렉션이 사용하는 인덱스를 한곳에 선언하고, 앱 시작 시(init_db) 멱등적으로 생성합니다.
+# `python -m db.indexes` 로 실행하면 인덱스 적용 후 주요 쿼리의 실행 계획을 검사합니다.
+import asyncio
+import sys
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+from core.config import settings
+
+# 논리 DB 역할 -> 설정의 데이터베이스 이름
+# 여러 역할이 같은 DB를 써도 선언이 합쳐지지 않도록 INDEXES/HOT_QUERIES는 역할로 구분하고, 적용할 때 이름을 찾습니다.
+DB_ROLES: dict[str, str] = {
+    "user": "MONGO_USER_DB_NAME",
+    "chat": "MONGO_CHAT_DB_NAME",
+    "recipe": "MONGO_RECIPE_DB_NAME",
+}
+
+
+def db_name(role: str) -> str:
+    """역할("user"/"chat"/"recipe")에 해당하는 데이터베이스 이름을 반환합니다."""
+    return getattr(settings, DB_ROLES[role])
+
+
+# DB 역할 -> {컬렉션 이름 -> 인덱스 목록}
+INDEXES: dict[str, dict[str, list[IndexModel]]] = {
+    "user": {
+        "users": [
+            IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        ],
+        "bookmarks": [
+            # 같은 레시피 중복 북마크 방지 (기존 중복은 python -m db.migrations 로 정리)
+            IndexModel([("user_id", ASCENDING), ("recipe_id", ASCENDING)], name="user_recipe", unique=True),
+            IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="user_created_at"),
+        ],
+    },
+    "chat": {
+        "chat_sessions": [
+            IndexModel([("user_id", ASCENDING), ("updated_at", DESCENDING)], name="user_updated_at"),
+        ],
+        "chat_messages": [
+            IndexModel([("session_id", ASCENDING), ("created_at", ASCENDING)], name="session_created_at"),
+        ],
+    },
+    "recipe": {
+        # 목록 조회는 _id 역순 keyset 페이지네이션이므로 필터 필드 뒤에 _id를 둡니다.
+        "recipes": [
+            IndexModel([("category", ASCENDING), ("_id", DESCENDING)], name="category_id"),
+            IndexModel([("difficulty", ASCENDING), ("_id", DESCENDING)], name="difficulty_id"),
+            IndexModel([("suitableBodyTypes", ASCENDING), ("_id", DESCENDING)], name="body_types_id"),
+            IndexModel([("keyIngredients", ASCENDING), ("_id", DESCENDING)], name="key_ingredients_id"),
+            # 알레르기/식이 제한 제외 필터 (crud.recipe.build_exclusion_filter)
+            IndexModel([("allergenTerms", ASCENDING)], name="allergen_terms"),
+            # 인기 레시피 조회 (북마크 수 정렬)
+            IndexModel([("bookmarkCount", DESCENDING), ("_id", DESCENDING)], name="bookmark_count_id"),
+            IndexModel([("suitableBodyTypes", ASCENDING), ("bookmarkCount", DESCENDING), ("_id", DESCENDING)], name="body_types_bookmark_count_id"),
+            # 메모리 인덱스 증분 갱신 (utils.recipe_indexes.refresh_recipe_indexes)
+            IndexModel([("updatedAt", ASCENDING)], name="updated_at"),
+        ],
+        "recipe_stats": [
+            IndexModel([("dimension", ASCENDING), ("value", ASCENDING)], name="dimension_value", unique=True),
+        ],
+        # 미리 생성해 둔 레시피 재고: 칸(체질, 카테고리, 난이도)별로 오래된 것부터 꺼냄
+        "recipe_stock": [
+            IndexModel([("constitution", ASCENDING), ("category", ASCENDING), ("difficulty", ASCENDING), ("created_at", ASCENDING)], name="cell_created_at"),
+        ],
+        "experiments": [
+            IndexModel([("experiment_id", ASCENDING)], name="experiment_id"),
+        ],
+        "experiment_jobs": [
+            IndexModel([("experiment_id", ASCENDING)], name="experiment_id", unique=True),
+        ],
+        "experiment_tokens": [
+            IndexModel([("experiment_id", ASCENDING)], name="experiment_id"),
+        ],
+    },
+}
+
+# 실행 계획을 검사할 주요 쿼리: (DB 역할, 컬렉션, 필터, 정렬)
+HOT_QUERIES: list[tuple[str, str, dict, list | None]] = [
+    ("user", "users", {"email": ""}, None),
+    ("user", "bookmarks", {"user_id": ""}, None),
+    ("chat", "chat_messages", {"session_id": None}, [("created_at", ASCENDING)]),
+    ("chat", "chat_sessions", {"user_id": ""}, [("updated_at", DESCENDING)]),
+    ("recipe", "experiments", {"experiment_id": ""}, None),
+    ("recipe", "recipes", {"category": ""}, [("_id", DESCENDING)]),
+    ("recipe", "recipes", {"suitableBodyTypes": ""}, [("_id", DESCENDING)]),
+    ("recipe", "recipe_stock", {"constitution": "", "category": None, "difficulty": None}, [("created_at", ASCENDING)]),
+]
+
+
+async def ensure_indexes(client) -> None:
+    """INDEXES에 선언된 인덱스를 생성합니다. 이미 존재하는 인덱스는 그대로 두므로 여러 번 호출해도 안전합니다."""
+    for role, collections in INDEXES.items():
+        name = db_name(role)
+        db = client[name]
+        for collection_name, indexes in collections.items():
+            try:
+                await db[collection_name].create_indexes(indexes)
+            except OperationFailure as e:
+                # 기존 데이터 중복 등으로 생성에 실패해도 서버 기동은 계속합니다.
+                print(f"[indexes] {name}.{collection_name} 인덱스 생성 실패: {e}")
+
+
+def _has_collscan(plan) -> bool:
+    """실행 계획 트리에 COLLSCAN 단계가 있는지 재귀적으로 확인합니다."""
+    if isinstance(plan, dict):
+        if plan.get("stage") == "COLLSCAN":
+            return True
+        return any(_has_collscan(v) for v in plan.values())
+    if isinstance(plan, list):
+        return any(_has_collscan(v) for v in plan)
+    return False
+
+
+async def verify_hot_queries(client) -> list[str]:
+    """HOT_QUERIES의 실행 계획을 explain()으로 확인하고, 컬렉션 전체 스캔을 하는 쿼리 목록을 반환합니다."""
+    failures: list[str] = []
+    for role, collection_name, query, sort in HOT_QUERIES:
+        name = db_name(role)
+        cursor = client[name][collection_name].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explain = await cursor.explain()
+        winning_plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+        if _has_collscan(winning_plan):
+            failures.append(f"{name}.{collection_name} {query} sort={sort}")
+    return failures
+
+
+async def _main() -> int:
+    from db.mongo import init_db
+    import db.mongo as mongo
+
+    async with init_db():
+        failures = await verify_hot_queries(mongo.client)
+    for failure in failures:
+        print(f"[indexes] COLLSCAN: {failure}")
+    print(f"[indexes] 검사 완료: {len(HOT_QUERIES) - len(failures)}/{len(HOT_QUERIES)} 통과")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main()))
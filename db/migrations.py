@@ -0,0 +1,96 @@
+# db/migrations.py -- 일회성 데이터 마이그레이션
+# 새로 추가된 파생 필드(allergenTerms, bookmarkCount)를 기존 문서에 채우고, 고유 인덱스를 막는 중복 북마크를 정리합니다.
+# 여러 번 실행해도 결과가 같도록 작성합니다.
+# 사용법: python -m db.migrations
+import asyncio
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import OperationFailure
+from core.config import settings
+from db.indexes import INDEXES
+from utils.allergen_filter import recipe_allergen_terms
+
+BATCH_SIZE = 1000
+
+
+async def _bulk_update(collection, ops: list[UpdateOne]) -> int:
+    updated = 0
+    for i in range(0, len(ops), BATCH_SIZE):
+        updated += (await collection.bulk_write(ops[i:i + BATCH_SIZE], ordered=False)).modified_count
+    return updated
+
+
+async def backfill_allergen_terms(recipe_db) -> int:
+    """
+    모든 레시피의 allergenTerms를 현재 규칙(utils.allergen_filter.recipe_allergen_terms)으로 다시 계산하고,
+    값이 바뀐 레시피 수를 반환합니다. 알레르기 재료 표를 고친 뒤에도 다시 실행합니다.
+    """
+    updated = 0
+    ops: list[UpdateOne] = []
+    cursor = recipe_db['recipes'].find({}, {'ingredients': 1, 'keyIngredients': 1, 'allergenTerms': 1})
+    async for doc in cursor:
+        terms = recipe_allergen_terms(doc)
+        if doc.get('allergenTerms') == terms:
+            continue
+        ops.append(UpdateOne({'_id': doc['_id']}, {'$set': {'allergenTerms': terms}}))
+        if len(ops) >= BATCH_SIZE:
+            updated += await _bulk_update(recipe_db['recipes'], ops)
+            ops = []
+    return updated + await _bulk_update(recipe_db['recipes'], ops)
+
+
+async def dedupe_bookmarks(user_db) -> int:
+    """
+    같은 (user_id, recipe_id) 북마크 중 가장 먼저 만든 것만 남기고 삭제한 뒤, 삭제한 수를 반환합니다.
+    중복이 남아 있으면 user_recipe 고유 인덱스를 만들 수 없으므로, 기존 비고유 인덱스도 고유 인덱스로 다시 만듭니다.
+    """
+    bookmarks = user_db['bookmarks']
+    duplicates = bookmarks.aggregate([
+        {'$sort': {'created_at': 1, '_id': 1}},
+        {'$group': {'_id': {'user_id': '$user_id', 'recipe_id': '$recipe_id'}, 'ids': {'$push': '$_id'}, 'count': {'$sum': 1}}},
+        {'$match': {'count': {'$gt': 1}}},
+    ], allowDiskUse=True)
+    removed = 0
+    async for group in duplicates:
+        removed += (await bookmarks.delete_many({'_id': {'$in': group['ids'][1:]}})).deleted_count
+
+    index_info = await bookmarks.index_information()
+    if 'user_recipe' in index_info and not index_info['user_recipe'].get('unique'):
+        await bookmarks.drop_index('user_recipe')
+    try:
+        await bookmarks.create_indexes(INDEXES['user']['bookmarks'])
+    except OperationFailure as e:
+        print(f"[migrations] bookmarks 인덱스 생성 실패: {e}")
+    return removed
+
+
+async def backfill_bookmark_counts(user_db, recipe_db) -> int:
+    """'bookmarks'를 recipe_id별로 집계해 레시피의 bookmarkCount를 다시 맞추고, 갱신한 레시피 수를 반환합니다."""
+    counts: dict[ObjectId, int] = {}
+    async for group in user_db['bookmarks'].aggregate([
+        {'$group': {'_id': '$recipe_id', 'count': {'$sum': 1}}},
+    ], allowDiskUse=True):
+        if isinstance(group['_id'], str) and ObjectId.is_valid(group['_id']):
+            counts[ObjectId(group['_id'])] = group['count']
+
+    ops = [UpdateOne({'_id': recipe_id}, {'$set': {'bookmarkCount': count}}) for recipe_id, count in counts.items()]
+    # 북마크가 하나도 없는데 카운터가 남아 있거나 필드가 없는 레시피는 0으로
+    async for doc in recipe_db['recipes'].find({'bookmarkCount': {'$ne': 0}}, {'_id': 1}):
+        if doc['_id'] not in counts:
+            ops.append(UpdateOne({'_id': doc['_id']}, {'$set': {'bookmarkCount': 0}}))
+    return await _bulk_update(recipe_db['recipes'], ops)
+
+
+async def _main() -> None:
+    from db.mongo import init_db, get_database
+
+    async with init_db():
+        user_db = get_database(settings.MONGO_USER_DB_NAME)
+        recipe_db = get_database(settings.MONGO_RECIPE_DB_NAME)
+        print(f"[migrations] allergenTerms 백필: {await backfill_allergen_terms(recipe_db)}건")
+        print(f"[migrations] 중복 북마크 삭제: {await dedupe_bookmarks(user_db)}건")
+        print(f"[migrations] bookmarkCount 백필: {await backfill_bookmark_counts(user_db, recipe_db)}건")
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
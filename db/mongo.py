@@ -5,7 +5,10 @@ from core.config import settings  # BaseSettings 인스턴스 import
 from pymongo.collection import Collection
 from pymongo.errors import ConnectionFailure  # MongoDB 연결 오류 처리
 from contextlib import asynccontextmanager
+from db.indexes import ensure_indexes
+from db.pool_metrics import pool_metrics
 
+# 프로세스당 하나의 MongoDB 클라이언트(커넥션 풀)를 lifespan에서 생성해 공유합니다.
 client: AsyncIOMotorClient = None
 db = None
 
@@ -18,16 +21,26 @@ async def init_db(app=None):
         client = AsyncIOMotorClient(
             settings.MONGO_URL,
             tls=True,
-            tlsCAFile=certifi.where()
+            tlsCAFile=certifi.where(),
+            maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+            minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+            maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS,
+            waitQueueTimeoutMS=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            connectTimeoutMS=settings.MONGO_CONNECT_TIMEOUT_MS,
+            event_listeners=[pool_metrics],
         )
         db_name = settings.MONGO_USER_DB_NAME  # 사용자 정보용 기본 DB 이름
         db = client[db_name]
 
-        # 연결이 성공했는지 확인 (간단히 ping 테스트)
-        client.admin.command('ping')  # MongoDB 연결 상태 확인
+        # 연결이 성공했는지 확인 (ping 응답을 기다려 기동 시점에 연결 상태를 검증)
+        await client.admin.command('ping')
 
         print(f"MongoDB 연결 성공: {db_name}")
 
+        # 컬렉션별 인덱스 적용 (이미 존재하면 변경 없음)
+        await ensure_indexes(client)
+
         # FastAPI 애플리케이션이 종료될 때까지 유지
         yield
 
@@ -37,8 +50,16 @@ async def init_db(app=None):
     finally:
         if client:
             client.close()  # MongoDB 클라이언트 종료
+            client = None
+            db = None
             print("MongoDB 연결 종료")
 
+# 공유 클라이언트에서 데이터베이스 가져오기
+def get_database(db_name: str):
+    if client is None:
+        raise Exception("MongoDB 클라이언트가 초기화되지 않았습니다.")
+    return client.get_database(db_name)
+
 # 사용되는 데이터베이스와 컬렉션 가져오기
 def get_collection(collection_name: str) -> Collection:
     if db is None:
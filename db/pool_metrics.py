@@ -0,0 +1,89 @@
+# db/pool_metrics.py -- pymongo CMAP 이벤트로 커넥션 풀 사용량을 집계
+import threading
+from pymongo import monitoring
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """
+    커넥션 체크아웃 횟수, 대기 시간, 사용 중인 커넥션 수 등을 집계합니다.
+    pymongo는 여러 스레드에서 이벤트를 발생시키므로 카운터는 lock으로 보호합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connections_created = 0
+        self.connections_closed = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.checked_out = 0
+        self.max_checked_out = 0
+        self.pool_clears = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _record_wait(self, event) -> None:
+        duration = getattr(event, "duration", None)
+        if duration is not None:
+            self.total_wait_seconds += duration
+            self.max_wait_seconds = max(self.max_wait_seconds, duration)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pool_clears += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            self.connections_created += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.connections_closed += 1
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures += 1
+            self._record_wait(event)
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.max_checked_out = max(self.max_checked_out, self.checked_out)
+            self._record_wait(event)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            attempts = self.checkouts + self.checkout_failures
+            return {
+                "open_connections": self.connections_created - self.connections_closed,
+                "connections_created": self.connections_created,
+                "checked_out": self.checked_out,
+                "max_checked_out": self.max_checked_out,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "pool_clears": self.pool_clears,
+                "avg_wait_ms": self.total_wait_seconds / attempts * 1000 if attempts else 0.0,
+                "max_wait_ms": self.max_wait_seconds * 1000,
+            }
+
+
+pool_metrics = PoolMetricsListener()
@@ -1,35 +1,23 @@
-# db/session.py -- MongoDB 연결을 관리, motor를 이용해 mongodb와 연결
-# MongoDB는 초기화가 따로 필요하지 않음, 여기서는 필요한 인덱스 등을 설정할 수 있음
-from motor.motor_asyncio import AsyncIOMotorClient
-import certifi
+# db/session.py -- 요청별 데이터베이스 의존성
+# MongoDB 클라이언트는 db/mongo.py의 lifespan(init_db)에서 프로세스당 하나만 생성되며,
+# 여기서는 그 공유 클라이언트에서 용도별 데이터베이스를 꺼내 제공합니다.
 from core.config import settings
-
-# MongoDB 클라이언트 초기화 (TLS CA 번들 설정 포함)
-client = AsyncIOMotorClient(
-    settings.MONGO_URL,
-    tls=True,
-    tlsCAFile=certifi.where()
-)
-
-# 분리된 데이터베이스 인스턴스
-user_db = client.get_database(settings.MONGO_USER_DB_NAME)
-recipe_db = client.get_database(settings.MONGO_RECIPE_DB_NAME)
-chat_db = client.get_database(settings.MONGO_CHAT_DB_NAME)
+from db.mongo import get_database
 
 def get_user_db():
     try:
-        yield user_db
+        yield get_database(settings.MONGO_USER_DB_NAME)
     finally:
-        pass  # DB 연결을 자동으로 종료할 필요가 있을 때 적절한 코드 추가
+        pass  # 커넥션은 공유 풀에서 관리되므로 요청 종료 시 별도 정리 불필요
 
 def get_recipe_db():
     try:
-        yield recipe_db
+        yield get_database(settings.MONGO_RECIPE_DB_NAME)
     finally:
-        pass  # DB 연결을 자동으로 종료할 필요가 있을 때 적절한 코드 추가
+        pass  # 커넥션은 공유 풀에서 관리되므로 요청 종료 시 별도 정리 불필요
 
 def get_chat_db():
     try:
-        yield chat_db
+        yield get_database(settings.MONGO_CHAT_DB_NAME)
     finally:
-        pass  # DB 연결을 자동으로 종료할 필요가 있을 때 적절한 코드 추가
+        pass  # 커넥션은 공유 풀에서 관리되므로 요청 종료 시 별도 정리 불필요
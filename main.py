@@ -5,7 +5,14 @@ import sys
 from fastapi.openapi.utils import get_openapi
 from starlette.websockets import WebSocket
 
+from contextlib import asynccontextmanager
 from db.mongo import init_db
+from core.http_client import init_ai_client
+from core.config import settings
+from core.compression import CompressionMiddleware
+from utils.recipe_indexes import init_recipe_indexes
+from utils.cheduled_recipe_generator import init_recipe_generator
+from utils.recipe_stock import init_recipe_stock
 import uvicorn
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
@@ -20,11 +27,18 @@ if sys.platform.startswith("win") and sys.version_info >= (3, 8):
     asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
 
 
+# 앱 lifespan: MongoDB 연결, AI 서비스용 공유 HTTP 클라이언트, 레시피 메모리 인덱스, 예약 레시피 생성, 레시피 재고 보충을 함께 관리
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with init_db(app), init_ai_client(app), init_recipe_indexes(app), init_recipe_generator(app), init_recipe_stock(app):
+        yield
+
+
 app = FastAPI(
     title="My FastAPI Project",
     description="API documentation",
     version="1.0.0",
-    lifespan=init_db,  # lifespan으로 MongoDB 연결 처리
+    lifespan=lifespan,  # lifespan으로 MongoDB 연결 및 HTTP 클라이언트 처리
 )
 def custom_openapi():
     if app.openapi_schema:
@@ -63,8 +77,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],  # 웹 클라이언트에서 조건부 GET(If-None-Match)에 사용
 )
 
+# 큰 JSON 응답(실험 목록, 채팅 기록 등) 압축. SSE와 작은 응답은 미들웨어에서 건너뜀
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
 # 웹소켓 연결 처리 예시
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
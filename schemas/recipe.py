@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Optional, Dict, Any
 from datetime import datetime
 
 class Recipe(BaseModel):
@@ -21,6 +21,16 @@ class Recipe(BaseModel):
     category: str = Field(..., description="카테고리 (한식, 중식 등)")
     keyIngredients: list[str] = Field(..., description="중요 재료 목록 (육류, 해산물 등)")
     lastEditReason: Optional[str] = Field(None, description="최신 수정 사유")
+    bookmarkCount: int = Field(0, description="북마크 수 (서버에서 관리)")
+
+class RecipePage(BaseModel):
+    items: list[Recipe] = Field(default_factory=list, description="현재 페이지의 레시피 목록")
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 조회용 커서 (마지막 페이지면 null)")
+
+class AutocompleteSuggestion(BaseModel):
+    text: str = Field(..., description="자동완성 후보 문자열")
+    type: str = Field(..., description="후보 종류 (title, ingredient, tag)")
+    score: float = Field(..., description="평점과 북마크 수로 계산한 가중치")
 
 class BookmarkCreate(BaseModel):
     recipe_id: str = Field(..., description="레시피 ID")
@@ -31,6 +41,16 @@ class BookmarkOut(BaseModel):
     recipe_id: str = Field(..., description="레시피 ID")
     created_at: Optional[datetime] = Field(None, description="생성일시")
 
+class BookmarkedRecipeOut(BaseModel):
+    bookmark_id: str = Field(..., description="북마크 고유 ID")
+    recipe_id: str = Field(..., description="레시피 ID")
+    created_at: Optional[datetime] = Field(None, description="북마크 생성일시")
+    recipe: Optional[Dict[str, Any]] = Field(None, description="북마크된 레시피 (삭제된 레시피면 null, fields=card면 카드용 필드만 포함)")
+
+class BookmarkedRecipePage(BaseModel):
+    items: list[BookmarkedRecipeOut] = Field(default_factory=list, description="현재 페이지의 북마크 레시피 목록")
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 조회용 커서 (마지막 페이지면 null)")
+
 class RecipeUpdateRequest(BaseModel):
     title: Optional[str] = Field(None, description="레시피 제목")
     description: Optional[str] = Field(None, description="레시피 설명")
@@ -0,0 +1,9 @@
+# 테스트는 DB/AI 서비스 없이 실행되므로 필수 설정에 더미 값을 채움
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.bench_env import use_dummy_settings
+
+use_dummy_settings("test")
@@ -0,0 +1,64 @@
+import pytest
+from utils.allergen_filter import AllergenFilter, recipe_allergen_terms
+from utils.recipe_indexes import normalize_ingredient
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("땅콩버터2큰술", "땅콩버터"),
+    ("계란2개", "계란"),
+    ("우유200ml", "우유"),
+    ("돼지고기 300g", "돼지고기"),
+    ("간장 2큰술(선택)", "간장"),
+    ("1/2컵 설탕", "설탕"),
+    ("호두한줌", "호두"),
+    ("양파 반개", "양파"),
+    ("소금 약간", "소금 약간"),
+])
+def test_normalize_ingredient_strips_quantity(text, expected):
+    assert normalize_ingredient(text) == expected
+
+
+def _filter(*recipes: tuple[str, list[str]]) -> AllergenFilter:
+    index = AllergenFilter()
+    index.build([{"id": rid, "ingredients": ingredients} for rid, ingredients in recipes])
+    return index
+
+
+def test_quantity_suffixed_ingredients_are_excluded():
+    index = _filter(
+        ("peanut", ["땅콩버터2큰술", "식빵 2장"]),
+        ("egg", ["계란2개", "쪽파 1대"]),
+        ("milk", ["우유200ml", "바나나 1개"]),
+        ("plain", ["두부 1모", "간장 1큰술"]),
+    )
+    assert index.excluded_ids(["땅콩"]) == {"peanut"}
+    assert index.excluded_ids(["계란"]) == {"egg"}
+    assert index.excluded_ids([], ["유제품 제외"]) == {"milk"}
+    assert index.allowed_ids(["peanut", "egg", "milk", "plain"], ["땅콩", "우유"]) == ["egg", "plain"]
+
+
+def test_native_quantity_is_stripped_before_matching():
+    index = _filter(("walnut", ["호두한줌"]))
+    assert index.excluded_ids(["호두"]) == {"walnut"}
+    assert index.excluded_ids([], ["견과류 제외"]) == {"walnut"}
+
+
+def test_keywords_do_not_match_unrelated_compounds():
+    # '버터'(유제품)는 '땅콩버터'를, '밀'은 '밀크'를 제외하지 않음
+    index = _filter(
+        ("peanut_butter", ["땅콩버터 1큰술"]),
+        ("butter", ["무염버터 10g"]),
+        ("pork", ["돼지고기 목살 300g"]),
+        ("milk_tea", ["밀크티 1컵"]),
+    )
+    assert index.excluded_ids(["버터"]) == {"butter"}
+    assert index.excluded_ids(["밀"]) == set()
+    assert index.excluded_ids([], ["채식"]) == {"pork"}
+    assert index.excluded_ids(["목살"]) == {"pork"}
+
+
+def test_recipe_allergen_terms_include_matching_keywords():
+    terms = set(recipe_allergen_terms({"ingredients": ["땅콩버터2큰술", "우유200ml"], "keyIngredients": ["견과류"]}))
+    assert {"땅콩버터", "땅콩", "견과류", "우유", "유제품"} <= terms
+    assert "버터" not in terms
+    assert not any(any(ch.isdigit() for ch in term) for term in terms)
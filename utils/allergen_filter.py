@@ -0,0 +1,243 @@
+# 알레르기/식이 제한 레시피 제외 필터 (비트셋 기반)
+# 재료 어휘(vocabulary)와 레시피 슬롯을 정수 비트셋으로 표현해, "땅콩·유제품 제외" 같은 조건을
+# 레시피마다 재료 목록을 훑지 않고 카탈로그 전체에 대한 비트 OR/AND-NOT 연산 몇 번으로 계산합니다.
+# (파이썬 int는 임의 길이 워드 배열이므로 별도 의존성 없이 벡터화된 비트 연산이 가능합니다.)
+from typing import Iterable
+from utils.recipe_indexes import normalize_ingredient, register_recipe_index
+
+# 식이 제한 -> 제외할 재료 단어 (주요 재료 분류 포함). 목록에 없는 제한은 단어 자체로 매칭합니다.
+DIETARY_EXCLUSIONS: dict[str, list[str]] = {
+    "채식": ["육류", "해산물", "고기", "생선", "새우", "멸치", "오징어", "조개"],
+    "vegetarian": ["육류", "해산물", "고기", "생선", "새우", "멸치", "오징어", "조개"],
+    "비건": ["육류", "해산물", "고기", "생선", "새우", "멸치", "오징어", "조개", "유제품", "우유", "치즈", "버터", "계란", "달걀", "꿀"],
+    "vegan": ["육류", "해산물", "고기", "생선", "새우", "멸치", "오징어", "조개", "유제품", "우유", "치즈", "버터", "계란", "달걀", "꿀"],
+    "글루텐프리": ["밀가루", "밀", "보리", "호밀", "부침가루", "빵가루"],
+    "유제품 제외": ["유제품", "우유", "치즈", "버터", "요거트", "생크림"],
+    "견과류 제외": ["견과류", "땅콩", "호두", "아몬드", "잣", "캐슈넛"],
+    "해산물 제외": ["해산물", "생선", "새우", "멸치", "오징어", "조개", "게"],
+}
+
+
+# 알레르기/식이 제한 단어 -> 그 단어로 제외해야 하는 재료 이름 (단어 자체는 항상 포함)
+# 부분 문자열로 매칭하면 '버터'(유제품)가 '땅콩버터'까지 제외하므로, 파생 재료는 이 표에 명시합니다.
+# 값에 다른 키가 있으면 그 키의 재료도 함께 포함합니다. ('견과류' -> '땅콩' -> '땅콩버터')
+ALLERGEN_INGREDIENTS: dict[str, tuple[str, ...]] = {
+    "육류": ("고기",),
+    "고기": ("돼지고기", "소고기", "쇠고기", "닭고기", "오리고기", "양고기", "다진고기"),
+    "돼지고기": ("삼겹살", "목살", "앞다리살", "항정살", "베이컨", "햄", "소시지", "스팸"),
+    "소고기": ("쇠고기", "차돌박이", "우둔살", "양지", "사태", "안심", "등심", "갈비"),
+    "닭고기": ("닭", "닭가슴살", "닭다리", "닭다리살", "닭봉", "닭안심"),
+    "해산물": ("생선", "새우", "멸치", "오징어", "조개", "게", "문어", "낙지", "주꾸미"),
+    "생선": ("고등어", "연어", "참치", "참치캔", "갈치", "삼치", "꽁치", "명태", "동태", "대구", "가자미", "광어", "장어"),
+    "새우": ("새우젓", "건새우", "칵테일새우", "대하", "새우살"),
+    "멸치": ("건멸치", "잔멸치", "멸치액젓"),
+    "오징어": ("마른오징어", "오징어채"),
+    "조개": ("굴", "전복", "홍합", "바지락", "모시조개", "가리비", "꼬막", "재첩", "조갯살"),
+    "굴": ("굴소스",),
+    "게": ("꽃게", "대게", "킹크랩", "게살", "게맛살"),
+    "유제품": ("우유", "치즈", "버터", "요거트", "생크림", "사워크림"),
+    "우유": ("연유", "분유", "저지방우유"),
+    "치즈": ("크림치즈", "모짜렐라치즈", "체다치즈", "파마산치즈", "리코타치즈", "슬라이스치즈", "피자치즈"),
+    "버터": ("무염버터", "가염버터"),
+    "요거트": ("요구르트", "그릭요거트", "플레인요거트"),
+    "계란": ("달걀", "계란노른자", "계란흰자", "노른자", "흰자", "메추리알", "마요네즈", "지단"),
+    "달걀": ("계란",),
+    "밀": ("밀가루",),
+    "밀가루": ("중력분", "박력분", "강력분", "부침가루", "튀김가루", "빵가루", "국수", "소면", "중면", "칼국수면",
+              "우동면", "라면", "파스타", "스파게티", "식빵", "빵", "만두피", "또띠아"),
+    "보리": ("보리쌀", "엿기름"),
+    "호밀": ("호밀빵",),
+    "견과류": ("땅콩", "호두", "아몬드", "잣", "캐슈넛", "피스타치오", "마카다미아", "헤이즐넛", "피칸"),
+    "땅콩": ("땅콩버터", "땅콩가루", "땅콩소스", "땅콩잼", "볶은땅콩"),
+    "호두": ("호두가루",),
+    "아몬드": ("아몬드가루", "아몬드슬라이스", "아몬드버터"),
+    "대두": ("콩",),
+    "콩": ("대두", "두부", "두유", "된장", "간장", "청국장", "콩가루", "유부", "낫또"),
+    "메밀": ("메밀가루", "메밀면", "메밀국수"),
+    "꿀": ("벌꿀", "아카시아꿀"),
+    "토마토": ("방울토마토", "토마토소스", "토마토페이스트", "케첩", "토마토케첩"),
+    "복숭아": ("황도", "백도"),
+}
+
+
+def _expand(word: str, seen: set[str]) -> set[str]:
+    if word in seen:
+        return seen
+    seen.add(word)
+    for ingredient in ALLERGEN_INGREDIENTS.get(word, ()):
+        _expand(ingredient, seen)
+    return seen
+
+
+# 단어 -> 제외할 재료 이름 집합 (표를 따라 펼친 결과)
+_EXPANSIONS: dict[str, frozenset[str]] = {
+    word: frozenset(_expand(word, set()))
+    for word in {*ALLERGEN_INGREDIENTS, *(w for words in DIETARY_EXCLUSIONS.values() for w in words)}
+}
+
+# 레시피 문서의 allergenTerms에 미리 풀어 저장해 두는 알레르기/식이 제한 단어
+# 재료 이름이 단어의 재료 집합에 속하면('땅콩버터' -> '땅콩') 단어 자체를 allergenTerms에 넣어, MongoDB에서 $nin 으로 제외합니다.
+ALLERGEN_KEYWORDS: frozenset[str] = frozenset(_EXPANSIONS)
+
+
+def exclusion_words(allergies: Iterable[str] = (), dietary_restrictions: Iterable[str] = ()) -> set[str]:
+    """알레르기와 식이 제한을 제외할 재료 단어 집합으로 풀어 씁니다. 목록에 없는 제한은 단어 자체로 매칭합니다."""
+    words = {a.strip().lower() for a in allergies or [] if a and a.strip()}
+    for restriction in dietary_restrictions or []:
+        if not restriction or not restriction.strip():
+            continue
+        restriction = restriction.strip().lower()
+        words.update(DIETARY_EXCLUSIONS.get(restriction, [restriction]))
+    return words
+
+
+def ingredient_terms(doc: dict) -> set[str]:
+    """레시피의 재료 어휘: 분량을 뺀 재료 이름, 여러 단어로 된 이름의 각 단어, 주요 재료."""
+    terms: set[str] = set()
+    for ingredient in doc.get("ingredients") or []:
+        if isinstance(ingredient, str):
+            name = normalize_ingredient(ingredient)
+            terms.add(name)
+            terms.update(name.split())
+    terms |= {i.strip().lower() for i in doc.get("keyIngredients") or [] if isinstance(i, str)}
+    terms.discard("")
+    return terms
+
+
+def recipe_allergen_terms(doc: dict) -> list[str]:
+    """
+    레시피 문서에 저장할 allergenTerms를 계산합니다.
+    재료 어휘(ingredient_terms)와, 재료 이름이 ALLERGEN_INGREDIENTS로 펼친 재료 집합에 속하는 알레르기 단어를 담습니다.
+    제외 단어는 이 목록과 정확히 일치할 때만 매칭합니다.
+    """
+    terms = ingredient_terms(doc)
+    terms |= {word for word, ingredients in _EXPANSIONS.items() if not ingredients.isdisjoint(terms)}
+    return sorted(terms)
+
+
+def _iter_bits(mask: int) -> Iterable[int]:
+    """비트셋에서 1인 비트의 위치를 오름차순으로 반환합니다."""
+    bits = bin(mask)[:1:-1]
+    pos = bits.find("1")
+    while pos != -1:
+        yield pos
+        pos = bits.find("1", pos + 1)
+
+
+def _bitset(positions: list[int], size: int) -> int:
+    """주어진 위치의 비트만 1인 비트셋을 만듭니다."""
+    buffer = bytearray((size + 7) // 8)
+    for pos in positions:
+        buffer[pos >> 3] |= 1 << (pos & 7)
+    return int.from_bytes(buffer, "little")
+
+
+class AllergenFilter:
+    fields = {"ingredients", "keyIngredients"}
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self) -> None:
+        self.vocab: dict[str, int] = {}          # 재료 단어 -> 어휘 번호
+        self.terms: list[str] = []               # 어휘 번호 -> 재료 단어
+        self.term_recipes: list[int] = []        # 어휘 번호 -> 해당 재료를 포함한 레시피 슬롯 비트셋
+        self.recipe_terms: list[int] = []        # 레시피 슬롯 -> 포함한 재료 어휘 비트셋
+        self.slot_ids: list[str | None] = []     # 레시피 슬롯 -> 레시피 id
+        self.slots: dict[str, int] = {}          # 레시피 id -> 슬롯
+        self.free_slots: list[int] = []
+
+    def build(self, docs: list[dict]) -> None:
+        # 레시피마다 큰 비트셋에 OR하면 매번 비트셋 전체를 복사하므로, 어휘별 슬롯을 모은 뒤 비트셋을 한 번에 만듦
+        fresh = AllergenFilter()
+        term_slots: list[list[int]] = []
+        for doc in docs:
+            if doc["id"] in fresh.slots:
+                continue
+            slot = len(fresh.slot_ids)
+            fresh.slot_ids.append(doc["id"])
+            fresh.slots[doc["id"]] = slot
+            term_bits = 0
+            for term in recipe_allergen_terms(doc):
+                term_id = fresh._term_id(term)
+                if term_id == len(term_slots):
+                    term_slots.append([])
+                term_slots[term_id].append(slot)
+                term_bits |= 1 << term_id
+            fresh.recipe_terms.append(term_bits)
+        fresh.term_recipes = [_bitset(slots, len(fresh.slot_ids)) for slots in term_slots]
+        self.__dict__.update(fresh.__dict__)
+
+    def _term_id(self, term: str) -> int:
+        term_id = self.vocab.get(term)
+        if term_id is None:
+            term_id = len(self.terms)
+            self.vocab[term] = term_id
+            self.terms.append(term)
+            self.term_recipes.append(0)
+        return term_id
+
+    def _remove(self, recipe_id: str) -> None:
+        slot = self.slots.pop(recipe_id, None)
+        if slot is None:
+            return
+        bit = 1 << slot
+        for term_id in _iter_bits(self.recipe_terms[slot]):
+            self.term_recipes[term_id] &= ~bit
+        self.recipe_terms[slot] = 0
+        self.slot_ids[slot] = None
+        self.free_slots.append(slot)
+
+    def add(self, doc: dict) -> None:
+        recipe_id = doc["id"]
+        self._remove(recipe_id)
+        # 분량을 뺀 재료 이름과 해당하는 알레르기 단어만 어휘로 등록 (MongoDB allergenTerms와 같은 규칙)
+        terms = recipe_allergen_terms(doc)
+        if self.free_slots:
+            slot = self.free_slots.pop()
+            self.slot_ids[slot] = recipe_id
+        else:
+            slot = len(self.slot_ids)
+            self.slot_ids.append(recipe_id)
+            self.recipe_terms.append(0)
+        self.slots[recipe_id] = slot
+        bit = 1 << slot
+        term_bits = 0
+        for term in terms:
+            term_id = self._term_id(term)
+            term_bits |= 1 << term_id
+            self.term_recipes[term_id] |= bit
+        self.recipe_terms[slot] = term_bits
+
+    def excluded_mask(self, allergies: Iterable[str] = (), dietary_restrictions: Iterable[str] = ()) -> int:
+        """제외해야 할 레시피 슬롯 비트셋을 계산합니다. 제외 단어는 어휘(recipe_allergen_terms)와 정확히 일치해야 합니다."""
+        recipe_mask = 0
+        for word in exclusion_words(allergies, dietary_restrictions):
+            term_id = self.vocab.get(word)
+            if term_id is not None:
+                recipe_mask |= self.term_recipes[term_id]
+        return recipe_mask
+
+    def excluded_ids(self, allergies: Iterable[str] = (), dietary_restrictions: Iterable[str] = ()) -> set[str]:
+        mask = self.excluded_mask(allergies, dietary_restrictions)
+        return {self.slot_ids[slot] for slot in _iter_bits(mask)}
+
+    def allowed_ids(self, recipe_ids: Iterable[str], allergies: Iterable[str] = (),
+                    dietary_restrictions: Iterable[str] = ()) -> list[str]:
+        """
+        주어진 레시피 id 중 제외 조건에 걸리지 않는 것만 순서를 유지해 반환합니다.
+        제외 조건이 있으면 아직 인덱스에 반영되지 않은(다른 워커에서 저장된) 레시피도 판단할 수 없으므로 제외합니다.
+        """
+        mask = self.excluded_mask(allergies, dietary_restrictions)
+        if not mask and not exclusion_words(allergies, dietary_restrictions):
+            return list(recipe_ids)
+        return [rid for rid in recipe_ids if rid in self.slots and not (mask >> self.slots[rid]) & 1]
+
+    def stats(self) -> dict:
+        return {
+            "recipes": len(self.slots),
+            "vocabulary": len(self.terms),
+        }
+
+
+allergen_filter = register_recipe_index(AllergenFilter())
@@ -0,0 +1,19 @@
+# 벤치마크/테스트용 더미 설정
+# 벤치마크와 테스트는 DB/AI 서비스 없이 실행되므로, core.config를 불러오기 전에 필수 설정에 더미 값을 채웁니다.
+# 이미 설정된 환경 변수는 덮어쓰지 않습니다.
+import os
+
+
+def use_dummy_settings(db_name: str = "bench") -> None:
+    """필수 설정 환경 변수가 없으면 더미 값으로 채웁니다. db_name은 세 DB 이름과 SECRET_KEY에 사용합니다."""
+    for key, value in {
+        "MONGO_URL": "mongodb://localhost:27017/",
+        "MONGO_USER_DB_NAME": db_name,
+        "MONGO_RECIPE_DB_NAME": db_name,
+        "MONGO_CHAT_DB_NAME": db_name,
+        "SECRET_KEY": db_name,
+        "ALGORITHM": "HS256",
+        "ACCESS_TOKEN_EXPIRE_MINUTES": "60",
+        "AI_DATA_URL": "http://localhost",
+    }.items():
+        os.environ.setdefault(key, value)
@@ -0,0 +1,64 @@
+# 로그인 처리량 벤치마크
+# 동시 로그인(bcrypt 검증) 중 이벤트 루프 지연을 측정해, 동기 호출과 스레드 풀 오프로딩을 비교합니다.
+# 사용법: python -m utils.bench_login --concurrency 50
+import argparse
+import asyncio
+import time
+
+from utils.bench_env import use_dummy_settings
+
+use_dummy_settings()
+
+from core.security import hash_password, verify_password, verify_password_async, password_hasher_stats
+
+
+async def _measure_loop_lag(stop: asyncio.Event, interval: float = 0.005) -> list[float]:
+    """interval마다 깨어나 실제로 지연된 시간을 기록합니다. 이벤트 루프가 막히면 지연이 커집니다."""
+    lags = []
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, time.perf_counter() - expected))
+    return lags
+
+
+async def _login_sync(password: str, hashed: str) -> bool:
+    return verify_password(password, hashed)
+
+
+async def _login_offloaded(password: str, hashed: str) -> bool:
+    return await verify_password_async(password, hashed)
+
+
+async def _run(login, concurrency: int, hashed: str) -> dict:
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(_measure_loop_lag(stop))
+    await asyncio.sleep(0.02)
+    started = time.perf_counter()
+    await asyncio.gather(*(login("bench-password", hashed) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    lags = sorted(await lag_task)
+    return {
+        "logins_per_sec": concurrency / elapsed,
+        "loop_lag_p50_ms": lags[len(lags) // 2] * 1000 if lags else 0.0,
+        "loop_lag_max_ms": lags[-1] * 1000 if lags else 0.0,
+    }
+
+
+async def main(concurrency: int) -> None:
+    hashed = hash_password("bench-password")
+    for name, login in (("sync", _login_sync), ("offloaded", _login_offloaded)):
+        result = await _run(login, concurrency, hashed)
+        print(
+            f"[{name:9}] {result['logins_per_sec']:.1f} logins/s, "
+            f"loop lag p50={result['loop_lag_p50_ms']:.1f}ms max={result['loop_lag_max_ms']:.1f}ms"
+        )
+    print(f"[executor] {password_hasher_stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="동시 로그인 중 이벤트 루프 응답성 벤치마크")
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency))
@@ -0,0 +1,91 @@
+# 레시피 전문 검색 지연 벤치마크
+# 합성 카탈로그로 메모리 검색 인덱스를 만든 뒤, 조건 없는 검색과 카테고리/난이도/체질 조건 검색,
+# 알레르기 제외 목록을 적용한 검색의 지연 시간(p50/p99)을 측정합니다.
+# 사용법: python -m utils.bench_search --recipes 100000 --queries 500
+import argparse
+import random
+import time
+
+from utils.bench_env import use_dummy_settings
+
+use_dummy_settings()
+
+from utils.recipe_search import RecipeSearchIndex
+
+CONSTITUTIONS = ["목양체질", "목음체질", "토양체질", "토음체질", "금양체질", "금음체질", "수양체질", "수음체질"]
+CATEGORIES = ["한식", "중식", "일식", "양식", "디저트", "음료"]
+DIFFICULTIES = ["쉬움", "중간", "어려움"]
+MAIN_INGREDIENTS = ["된장", "김치", "닭", "돼지고기", "소고기", "두부", "버섯", "감자", "고등어", "오징어",
+                    "새우", "시금치", "애호박", "가지", "연어", "단호박", "고구마", "콩나물", "미역", "계란"]
+DISHES = ["찌개", "볶음", "구이", "조림", "무침", "국", "전", "샐러드", "덮밥", "파스타", "수프", "죽"]
+TAGS = ["다이어트", "고단백", "저염", "면역", "피로회복", "간편식", "손님상", "야식", "도시락", "비건"]
+SIDE_INGREDIENTS = ["양파", "마늘", "대파", "간장", "참기름", "고춧가루", "설탕", "소금", "후추", "버터", "우유"]
+
+
+def make_recipe(i: int, rng: random.Random) -> dict:
+    main = rng.choice(MAIN_INGREDIENTS)
+    dish = rng.choice(DISHES)
+    return {
+        "id": f"{i:024x}",
+        "title": f"{main}{dish}",
+        "description": f"{rng.choice(TAGS)}에 좋은 {main} {dish} 레시피",
+        "ingredients": [f"{main} {rng.randint(1, 500)}g"] +
+                       [f"{side} {rng.randint(1, 3)}큰술" for side in rng.sample(SIDE_INGREDIENTS, 4)],
+        "tags": rng.sample(TAGS, 2),
+        "category": rng.choice(CATEGORIES),
+        "difficulty": rng.choice(DIFFICULTIES),
+        "suitableBodyTypes": rng.sample(CONSTITUTIONS, 2),
+    }
+
+
+def percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run(index: RecipeSearchIndex, queries: list[str], rng: random.Random, **filters) -> dict:
+    latencies = []
+    for query in queries:
+        kwargs = {key: value(rng) if callable(value) else value for key, value in filters.items()}
+        started = time.perf_counter()
+        index.search(query, **kwargs)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return {"p50_ms": percentile(latencies, 0.5), "p99_ms": percentile(latencies, 0.99)}
+
+
+def main(recipes: int, queries: int, seed: int) -> None:
+    rng = random.Random(seed)
+    docs = [make_recipe(i, rng) for i in range(recipes)]
+    index = RecipeSearchIndex()
+    started = time.perf_counter()
+    index.build(docs)
+    print(f"[build] {recipes}개 레시피 {time.perf_counter() - started:.2f}s, {index.stats()}")
+
+    words = MAIN_INGREDIENTS + DISHES + TAGS
+    query_list = [" ".join(rng.sample(words, rng.choice([1, 1, 2]))) for _ in range(queries)]
+    # 알레르기 제외 목록 크기 (예: '땅콩'은 전체 레시피의 약 28%)
+    excluded = {doc["id"] for doc in rng.sample(docs, int(recipes * 0.28))}
+    scenarios = {
+        "unfiltered": {},
+        "category": {"category": lambda r: r.choice(CATEGORIES)},
+        "category+difficulty+constitution": {
+            "category": lambda r: r.choice(CATEGORIES),
+            "difficulty": lambda r: r.choice(DIFFICULTIES),
+            "constitution": lambda r: r.choice(CONSTITUTIONS),
+        },
+        "excluded 28%": {"excluded_ids": excluded},
+        "constitution+excluded 28%": {"constitution": lambda r: r.choice(CONSTITUTIONS), "excluded_ids": excluded},
+    }
+    for name, filters in scenarios.items():
+        run(index, query_list[:20], rng, **filters)  # 워밍업 (BM25 길이 정규화 값 계산)
+        result = run(index, query_list, rng, **filters)
+        print(f"[{name:32}] p50={result['p50_ms']:.2f}ms p99={result['p99_ms']:.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="메모리 레시피 검색 인덱스 지연 벤치마크")
+    parser.add_argument("--recipes", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    main(args.recipes, args.queries, args.seed)
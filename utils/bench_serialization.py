@@ -0,0 +1,90 @@
+# 목록 응답 직렬화 벤치마크
+# 기본 경로(response_model 검증 + FastAPI jsonable_encoder + json)와 경량 경로(model_construct + TypeAdapter)를
+# 실제와 비슷한 레시피/채팅 메시지 목록으로 비교합니다.
+# 사용법: python -m utils.bench_serialization --count 500 --repeat 50
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from utils.bench_env import use_dummy_settings
+
+use_dummy_settings()
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from schemas.chat import ChatMessageOut
+from schemas.recipe import Recipe
+from utils.fast_json import BulkSerializer, FastJSONResponse
+
+_BODY_TYPES = ["목양체질", "목음체질", "토양체질", "토음체질", "금양체질", "금음체질", "수양체질", "수음체질"]
+_INGREDIENTS = ["돼지고기 300g", "두부 1모", "애호박 1/3개", "양파 1/2개", "대파 1대", "간장 2큰술", "다진마늘 1작은술", "고춧가루 1큰술"]
+
+
+def _recipe_docs(count: int) -> list[dict]:
+    rnd = random.Random(1492)
+    docs = []
+    for _ in range(count):
+        _id = ObjectId()
+        docs.append({
+            "_id": _id, "id": str(_id),
+            "title": "된장찌개 황금레시피", "description": "구수하고 깊은 맛의 집밥 된장찌개입니다. " * 3,
+            "difficulty": "쉬움", "cookTime": "30분", "ingredients": rnd.sample(_INGREDIENTS, 6),
+            "image": "https://example.com/recipe.jpg", "rating": round(rnd.uniform(3, 5), 1),
+            "suitableFor": "소화가 약한 분", "suitableBodyTypes": rnd.sample(_BODY_TYPES, 3),
+            "reason": "체질에 맞는 재료를 사용했습니다.", "tags": ["한식", "찌개", "집밥"],
+            "steps": [f"{i}. 재료를 손질하고 끓입니다." for i in range(1, 8)], "servings": "2인분",
+            "nutritionalInfo": "칼로리 350kcal, 단백질 20g", "category": "한식", "keyIngredients": ["육류", "콩류"],
+            "lastEditReason": None, "bookmarkCount": rnd.randint(0, 500),
+        })
+    return docs
+
+
+def _message_docs(count: int) -> list[dict]:
+    session_id = str(ObjectId())
+    started = datetime(2025, 1, 1)
+    return [
+        {"id": str(ObjectId()), "session_id": session_id, "role": "user" if i % 2 == 0 else "assistant",
+         "content": "오늘 저녁으로 먹기 좋은 체질 맞춤 레시피를 추천해 주세요. " * 4,
+         "created_at": started + timedelta(seconds=i)}
+        for i in range(count)
+    ]
+
+
+def _default_path(model, docs: list[dict]) -> bytes:
+    """FastAPI 기본 경로와 같은 순서: response_model 검증 -> jsonable_encoder -> json 인코딩."""
+    validated = TypeAdapter(list[model]).validate_python(docs, from_attributes=True)
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def _fast_path(serializer: BulkSerializer, docs: list[dict]) -> bytes:
+    return FastJSONResponse(serializer.dump_json(docs)).body
+
+
+def _time(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main(count: int, repeat: int) -> None:
+    for name, model, docs in (("recipes", Recipe, _recipe_docs(count)), ("messages", ChatMessageOut, _message_docs(count))):
+        serializer = BulkSerializer(model)
+        default_ms = _time(lambda: _default_path(model, docs), repeat)
+        fast_ms = _time(lambda: _fast_path(serializer, docs), repeat)
+        size_kb = len(_fast_path(serializer, docs)) / 1024
+        print(
+            f"[{name:8}] {count}건 ({size_kb:.0f}KB): default={default_ms:.2f}ms "
+            f"fast={fast_ms:.2f}ms ({default_ms / fast_ms:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="목록 응답 직렬화 경로 비교 벤치마크")
+    parser.add_argument("--count", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    main(args.count, args.repeat)
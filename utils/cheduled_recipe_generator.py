@@ -1,7 +1,18 @@
-import os
-import requests
+# 예약 레시피 자동 생성 작업
+# 현재 레시피 통계에서 레시피가 적은 체질/카테고리/난이도/주요 재료를 우선 뽑아 생성 요청 payload를 만들고,
+# 공유 AI HTTP 클라이언트로 동시에(세마포어로 상한) 생성한 뒤 'recipes' 컬렉션에 일괄 저장합니다.
+# 앱 lifespan에서 apscheduler로 주기 실행하거나(RECIPE_GENERATOR_ENABLED), 단독 워커로 실행할 수 있습니다.
+# 사용법: python -m utils.cheduled_recipe_generator --count 30
+import argparse
+import asyncio
 import random
+from contextlib import asynccontextmanager
+from pydantic import ValidationError
 from core.config import settings
+from core.http_client import fetch_generated_recipes
+from crud.recipe import create_recipes_bulk, validate_recipes
+from crud.recipe_stats import get_recipe_stats
+from db.mongo import get_database
 
 CONSTITUTIONS = [
     "목양체질","목음체질","토양체질","토음체질",
@@ -11,31 +22,103 @@ CATEGORIES = ["한식","중식","일식","양식","디저트","음료"]
 DIFFICULTIES = ["쉬움","중간","어려움"]
 INGREDIENTS = ["육류","해산물","채소","과일","유제품","견과류"]
 
-API_URL = f"{settings.AI_DATA_URL}/api/v1/recipes/auto_generate"
-def generate_recipe_payload():
-    return {
-        "constitution": random.choice(CONSTITUTIONS),
-        "category": random.choice(CATEGORIES),
-        "difficulty": random.choices(DIFFICULTIES, weights=[0.7,0.2,0.1])[0],
-        "keyIngredients": random.sample(
-            INGREDIENTS,
-            k=random.choices([1,2,3], weights=[0.8,0.15,0.05])[0]
-        )
-    }
-
-def generate_recipes_batch(count=30):
-    recipes = []
-    for i in range(count):
-        payload = generate_recipe_payload()
-        try:
-            response = requests.post(API_URL, json=payload)
-            response.raise_for_status()
-            result = response.json()
-            recipes.extend(result)
-        except Exception as e:
-            print(f"[자동생성] {i+1}/{count} 실패: {e}")
-    print(f"[자동생성] {len(recipes)}개 레시피 생성 완료")
-    return recipes
+
+def _inverse_weights(values: list[str], counts: dict[str, int]) -> list[float]:
+    """레시피 수가 적은 값일수록 크게 뽑히도록 1/(count+1) 가중치를 계산합니다."""
+    return [1.0 / (counts.get(value, 0) + 1) for value in values]
+
+
+async def sample_payloads(db, count: int) -> list[dict]:
+    """현재 레시피 통계(recipe_stats)를 기준으로 레시피가 적은 항목을 우선하는 생성 요청 payload를 count개 만듭니다."""
+    counts: dict[str, dict[str, int]] = {}
+    for stat in await get_recipe_stats(db):
+        counts.setdefault(stat["dimension"], {})[stat["value"]] = stat["count"]
+    constitution_weights = _inverse_weights(CONSTITUTIONS, counts.get("constitution", {}))
+    category_weights = _inverse_weights(CATEGORIES, counts.get("category", {}))
+    difficulty_weights = _inverse_weights(DIFFICULTIES, counts.get("difficulty", {}))
+    ingredient_weights = _inverse_weights(INGREDIENTS, counts.get("ingredient", {}))
+
+    payloads = []
+    for _ in range(count):
+        k = random.choices([1, 2, 3], weights=[0.8, 0.15, 0.05])[0]
+        ingredients: list[str] = []
+        while len(ingredients) < k:
+            ingredient = random.choices(INGREDIENTS, weights=ingredient_weights)[0]
+            if ingredient not in ingredients:
+                ingredients.append(ingredient)
+        payloads.append({
+            "constitution": random.choices(CONSTITUTIONS, weights=constitution_weights)[0],
+            "category": random.choices(CATEGORIES, weights=category_weights)[0],
+            "difficulty": random.choices(DIFFICULTIES, weights=difficulty_weights)[0],
+            "keyIngredients": ingredients,
+        })
+    return payloads
+
+
+async def generate_recipes_batch(db, count: int = 30, concurrency: int | None = None) -> list[dict]:
+    """
+    count개의 payload로 레시피 생성을 동시에 요청하고, 형식이 올바른 결과만 모아 한 번에 저장합니다.
+    저장된(또는 중복으로 병합된) 레시피 리스트를 반환합니다.
+    """
+    semaphore = asyncio.Semaphore(concurrency or settings.RECIPE_GENERATOR_CONCURRENCY)
+    payloads = await sample_payloads(db, count)
+
+    async def generate(i: int, payload: dict) -> list[dict]:
+        async with semaphore:
+            try:
+                # 응답마다 검증해 잘못된 응답 하나가 배치 전체 저장을 막지 않도록 함
+                return validate_recipes(await fetch_generated_recipes(payload))
+            except (ValidationError, ValueError, TypeError) as e:
+                print(f"[자동생성] {i + 1}/{count} 응답 형식 오류: {e}")
+            except Exception as e:
+                print(f"[자동생성] {i + 1}/{count} 실패: {e}")
+            return []
+
+    results = await asyncio.gather(*(generate(i, payload) for i, payload in enumerate(payloads)))
+    recipes = [recipe for result in results for recipe in result]
+    saved = await create_recipes_bulk(db, recipes, validate=False)
+    print(f"[자동생성] 요청 {count}건, 생성 {len(recipes)}개, 저장 {len(saved)}개")
+    return saved
+
+
+async def run_scheduled_generation() -> None:
+    try:
+        await generate_recipes_batch(get_database(settings.MONGO_RECIPE_DB_NAME), settings.RECIPE_GENERATOR_BATCH_SIZE)
+    except Exception as e:
+        print(f"[자동생성] 예약 작업 실패: {e}")
+
+
+# 예약 레시피 생성 스케줄러 (init_db, init_ai_client 이후에 실행)
+# 워커 프로세스마다 스케줄러가 뜨므로 다중 워커 배포에서는 한 곳에서만 켜거나 단독 워커로 실행합니다.
+@asynccontextmanager
+async def init_recipe_generator(app=None):
+    if not settings.RECIPE_GENERATOR_ENABLED:
+        yield
+        return
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+    scheduler = AsyncIOScheduler()
+    scheduler.add_job(
+        run_scheduled_generation, "interval", minutes=settings.RECIPE_GENERATOR_INTERVAL_MINUTES,
+        max_instances=1, coalesce=True,
+    )
+    scheduler.start()
+    try:
+        yield
+    finally:
+        scheduler.shutdown(wait=False)
+
+
+async def main(count: int, concurrency: int) -> None:
+    from db.mongo import init_db
+    from core.http_client import init_ai_client
+    from utils.recipe_indexes import init_recipe_indexes
+    async with init_db(), init_ai_client(), init_recipe_indexes():
+        await generate_recipes_batch(get_database(settings.MONGO_RECIPE_DB_NAME), count, concurrency)
+
 
 if __name__ == "__main__":
-    generate_recipes_batch(30)
+    parser = argparse.ArgumentParser(description="레시피 통계 기반 레시피 자동 생성")
+    parser.add_argument("--count", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=settings.RECIPE_GENERATOR_CONCURRENCY)
+    args = parser.parse_args()
+    asyncio.run(main(args.count, args.concurrency))
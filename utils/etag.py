@@ -0,0 +1,39 @@
+# 조건부 GET(ETag / If-None-Match) 공통 처리
+# 응답 본문 대신 문서 버전(version, lastEditedAt 등)으로 강한 ETag를 만들고,
+# 클라이언트가 보낸 If-None-Match와 같으면 본문을 만들지 않고 304를 반환합니다.
+import hashlib
+from fastapi import Request, Response, status
+
+# 리소스별 Cache-Control
+RECIPE_CACHE_CONTROL = "public, max-age=60, must-revalidate"
+STATS_CACHE_CONTROL = "public, max-age=30, must-revalidate"
+USER_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """리소스 종류/id/버전 값으로 강한 ETag 문자열을 만듭니다."""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()[:20]
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match 헤더에 etag가 포함되어 있는지 확인합니다. (If-None-Match는 약한 비교를 사용)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in header.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def set_etag_headers(response: Response, etag: str, cache_control: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """본문 없는 304 응답을 만듭니다."""
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_etag_headers(response, etag, cache_control)
+    return response
@@ -0,0 +1,60 @@
+# 대용량 목록 응답용 경량 JSON 직렬화
+# 기본 경로는 문서마다 response_model을 다시 검증해 모델을 만든 뒤 JSON으로 인코딩하므로,
+# 수백 건을 반환하는 목록 API에서는 직렬화가 처리 시간의 대부분을 차지합니다.
+# 우리 DB에서 방금 읽은 신뢰할 수 있는 데이터는 model_construct로 검증 없이 모델을 만들고,
+# TypeAdapter(pydantic-core)로 한 번에 JSON bytes로 직렬화해 그대로 응답합니다.
+# settings.FAST_JSON_RESPONSES가 꺼져 있으면 기존 경로(response_model 검증)를 그대로 사용합니다.
+from typing import Any, Generic, Type, TypeVar
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from core.config import settings
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json으로 대체
+    orjson = None
+    import json
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class FastJSONResponse(Response):
+    """orjson으로 인코딩하는 JSON 응답. 이미 직렬화된 bytes는 그대로 보냅니다."""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS, default=str)
+        return json.dumps(content, ensure_ascii=False, default=str, separators=(",", ":")).encode("utf-8")
+
+
+class BulkSerializer(Generic[ModelT]):
+    """
+    DB 문서 리스트를 재검증 없이 모델로 만든 뒤 TypeAdapter로 한 번에 JSON bytes로 직렬화합니다.
+    model_construct는 타입을 검사하지 않으므로 스키마대로 저장된 문서에만 사용해야 합니다.
+    """
+
+    def __init__(self, model: Type[ModelT]):
+        self.model = model
+        self.adapter = TypeAdapter(list[model])
+
+    def construct(self, docs: list[dict]) -> list[ModelT]:
+        construct = self.model.model_construct
+        return [construct(**doc) for doc in docs]
+
+    def dump_json(self, docs: list[dict]) -> bytes:
+        return self.adapter.dump_json(self.construct(docs), fallback=str)
+
+
+def dump_model_json(model: BaseModel) -> bytes:
+    """model_construct로 만든 (중첩) 모델을 JSON bytes로 직렬화합니다."""
+    return model.__pydantic_serializer__.to_json(model, fallback=str)
+
+
+def fast_list_response(serializer: BulkSerializer, docs: list[dict]):
+    """FAST_JSON_RESPONSES가 켜져 있으면 직렬화된 응답을, 아니면 docs를 그대로 반환합니다."""
+    if not settings.FAST_JSON_RESPONSES:
+        return docs
+    return FastJSONResponse(serializer.dump_json(docs))
@@ -0,0 +1,113 @@
+# 검색창 자동완성용 접두사 인덱스 (정렬 배열 + bisect)
+# 레시피 제목, 재료, 태그를 후보 단어로 모아 정렬된 배열에 두고, 입력한 접두사의 범위를 bisect로 찾습니다.
+# 후보 점수는 해당 단어를 포함한 레시피들의 평점과 북마크 수로 매깁니다.
+# 단어 사전은 참조 카운트로 증분 갱신하고, 정렬 배열은 단어가 추가/삭제된 뒤 첫 조회 때 다시 만듭니다.
+import heapq
+import math
+from bisect import bisect_left
+from utils.recipe_indexes import normalize_ingredient, register_recipe_index
+
+# 접두사 하나에 대해 점수를 비교할 최대 후보 수 (한 글자 입력 등 범위가 넓을 때 상한)
+MAX_SCAN = 5000
+
+
+def recipe_weight(doc: dict) -> float:
+    """평점(0~5)과 북마크 수로 레시피 가중치를 계산합니다."""
+    rating = min(float(doc.get("rating") or 0.0), 5.0) / 5.0
+    return 1.0 + rating + math.log1p(max(int(doc.get("bookmarkCount") or 0), 0))
+
+
+class RecipeAutocomplete:
+    fields = {"title", "ingredients", "tags", "rating", "bookmarkCount"}
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self) -> None:
+        self.terms: dict[str, dict] = {}                       # 정규화 단어 -> {text, type, refs, score}
+        self.recipes: dict[str, tuple[list, float]] = {}       # 레시피 id -> ((정규화 단어, 종류) 목록, 가중치)
+        self._sorted: list[str] = []
+        self._dirty = False
+
+    def build(self, docs: list[dict]) -> None:
+        fresh = RecipeAutocomplete()
+        for doc in docs:
+            fresh.add(doc)
+        fresh._refresh()
+        self.__dict__.update(fresh.__dict__)
+
+    @staticmethod
+    def _candidates(doc: dict) -> dict[str, tuple[str, str]]:
+        """레시피에서 자동완성 후보 단어를 추출합니다. (정규화 단어 -> (표시 문자열, 종류))"""
+        candidates: dict[str, tuple[str, str]] = {}
+        for tag in doc.get("tags") or []:
+            tag = tag.strip()
+            if tag:
+                candidates[tag.lower()] = (tag, "tag")
+        for ingredient in doc.get("ingredients") or []:
+            name = normalize_ingredient(ingredient)
+            if name:
+                candidates[name] = (name, "ingredient")
+        title = (doc.get("title") or "").strip()
+        if title:
+            candidates[title.lower()] = (title, "title")
+        return candidates
+
+    def _remove(self, recipe_id: str) -> None:
+        entry = self.recipes.pop(recipe_id, None)
+        if not entry:
+            return
+        keys, weight = entry
+        for key in keys:
+            term = self.terms[key]
+            term["refs"] -= 1
+            term["score"] -= weight
+            if term["refs"] <= 0:
+                del self.terms[key]
+                self._dirty = True
+
+    def add(self, doc: dict) -> None:
+        recipe_id = doc["id"]
+        self._remove(recipe_id)
+        weight = recipe_weight(doc)
+        candidates = self._candidates(doc)
+        for key, (text, kind) in candidates.items():
+            term = self.terms.get(key)
+            if term is None:
+                term = self.terms[key] = {"text": text, "type": kind, "refs": 0, "score": 0.0}
+                self._dirty = True
+            term["refs"] += 1
+            term["score"] += weight
+        self.recipes[recipe_id] = (list(candidates), weight)
+
+    def _refresh(self) -> None:
+        if self._dirty or len(self._sorted) != len(self.terms):
+            self._sorted = sorted(self.terms)
+            self._dirty = False
+
+    def suggest(self, prefix: str, limit: int = 10, kind: str | None = None) -> list[dict]:
+        """접두사로 시작하는 후보를 점수 내림차순으로 반환합니다. kind로 title/ingredient/tag만 고를 수 있습니다."""
+        prefix = (prefix or "").strip().lower()
+        if not prefix:
+            return []
+        self._refresh()
+        terms, keys = self.terms, self._sorted
+        start = bisect_left(keys, prefix)
+        matched = []
+        for key in keys[start:start + MAX_SCAN]:
+            if not key.startswith(prefix):
+                break
+            term = terms.get(key)
+            if term and (not kind or term["type"] == kind):
+                matched.append(term)
+        top = heapq.nlargest(limit, matched, key=lambda term: term["score"])
+        return [{"text": t["text"], "type": t["type"], "score": round(t["score"], 3)} for t in top]
+
+    def stats(self) -> dict:
+        return {
+            "recipes": len(self.recipes),
+            "terms": len(self.terms),
+        }
+
+
+recipe_autocomplete = register_recipe_index(RecipeAutocomplete())
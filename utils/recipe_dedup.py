@@ -0,0 +1,145 @@
+# LLM 생성 레시피 중복 감지
+# 제목 + 정규화된 재료 목록으로 정확 일치 지문(SHA-1)과 MinHash 서명을 만들고,
+# LSH 버킷으로 후보만 비교해 컬렉션을 훑지 않고 유사 레시피를 찾습니다.
+import hashlib
+import random
+import re
+from core.config import settings
+from utils.recipe_indexes import normalize_ingredient, register_recipe_index
+
+NUM_PERM = 64          # MinHash 서명 길이
+BANDS = 16             # LSH 밴드 수 (밴드당 NUM_PERM // BANDS 행)
+ROWS = NUM_PERM // BANDS
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(1492)  # 워커 간 동일한 해시 함수를 쓰도록 고정 시드
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(NUM_PERM)]
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def _hash64(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "big")
+
+
+class RecipeDeduplicator:
+    fields = {"title", "ingredients"}
+
+    def __init__(self, threshold: float = 0.8):
+        self.threshold = threshold
+        self.blocked = 0
+        self.checked = 0
+        self.clear()
+
+    def clear(self) -> None:
+        self.exact: dict[str, str] = {}                      # 지문 -> 레시피 id
+        self.buckets: dict[tuple, set[str]] = {}             # (밴드, 밴드 해시) -> 레시피 id 집합
+        self.entries: dict[str, tuple[str, tuple]] = {}      # 레시피 id -> (지문, MinHash 서명)
+
+    def build(self, docs: list[dict]) -> None:
+        fresh = RecipeDeduplicator(self.threshold)
+        for doc in docs:
+            fresh.add(doc)
+        self.exact, self.buckets, self.entries = fresh.exact, fresh.buckets, fresh.entries
+
+    @staticmethod
+    def _features(doc: dict) -> tuple[str, set[str]]:
+        title = _NON_WORD.sub("", (doc.get("title") or "").lower())
+        ingredients = sorted({normalize_ingredient(i) for i in doc.get("ingredients") or []} - {""})
+        fingerprint = hashlib.sha1(f"{title}|{','.join(ingredients)}".encode()).hexdigest()
+        shingles = {f"t:{title[i:i + 3]}" for i in range(max(1, len(title) - 2))}
+        shingles |= {f"i:{ingredient}" for ingredient in ingredients}
+        return fingerprint, shingles
+
+    @staticmethod
+    def _signature(shingles: set[str]) -> tuple:
+        hashes = [_hash64(s) for s in shingles] or [0]
+        return tuple(
+            min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+            for a, b in _PERMUTATIONS
+        )
+
+    @staticmethod
+    def _bands(signature: tuple):
+        for band in range(BANDS):
+            yield band, signature[band * ROWS:(band + 1) * ROWS]
+
+    def _remove(self, recipe_id: str) -> None:
+        entry = self.entries.pop(recipe_id, None)
+        if not entry:
+            return
+        fingerprint, signature = entry
+        if self.exact.get(fingerprint) == recipe_id:
+            del self.exact[fingerprint]
+        for key in self._bands(signature):
+            bucket = self.buckets.get(key)
+            if bucket:
+                bucket.discard(recipe_id)
+                if not bucket:
+                    del self.buckets[key]
+
+    def add(self, doc: dict) -> None:
+        recipe_id = doc["id"]
+        self._remove(recipe_id)
+        fingerprint, shingles = self._features(doc)
+        signature = self._signature(shingles)
+        self.entries[recipe_id] = (fingerprint, signature)
+        self.exact.setdefault(fingerprint, recipe_id)
+        for key in self._bands(signature):
+            self.buckets.setdefault(key, set()).add(recipe_id)
+
+    def find_duplicate(self, doc: dict) -> str | None:
+        """이미 색인된 레시피 중 doc과 같거나 유사도(추정 Jaccard)가 임계값 이상인 레시피 id를 반환합니다."""
+        fingerprint, shingles = self._features(doc)
+        existing = self.exact.get(fingerprint)
+        if existing:
+            return existing
+        signature = self._signature(shingles)
+        candidates: set[str] = set()
+        for key in self._bands(signature):
+            candidates |= self.buckets.get(key, set())
+        best_id, best_similarity = None, self.threshold
+        for candidate in candidates:
+            other = self.entries[candidate][1]
+            similarity = sum(1 for x, y in zip(signature, other) if x == y) / NUM_PERM
+            if similarity >= best_similarity:
+                best_id, best_similarity = candidate, similarity
+        return best_id
+
+    def check_and_record(self, doc: dict) -> str | None:
+        """find_duplicate로 중복을 찾고 검사/차단 수를 집계합니다. 저장 경로는 이 메서드로 중복을 확인합니다."""
+        self.checked += 1
+        existing = self.find_duplicate(doc)
+        if existing:
+            self.blocked += 1
+        return existing
+
+    def partition(self, docs: list[dict]) -> tuple[list[dict], list[str]]:
+        """
+        저장할 레시피 목록을 (새 레시피, 기존에 저장된 중복 레시피 id)로 나눕니다.
+        같은 요청 안에서 서로 중복되는 레시피는 첫 번째 것만 남깁니다.
+        """
+        batch = RecipeDeduplicator(self.threshold)
+        fresh: list[dict] = []
+        duplicate_ids: list[str] = []
+        for i, doc in enumerate(docs):
+            existing = self.check_and_record(doc)
+            if existing:
+                if existing not in duplicate_ids:
+                    duplicate_ids.append(existing)
+            elif batch.find_duplicate(doc):
+                self.blocked += 1
+            else:
+                batch.add({**doc, "id": f"batch:{i}"})
+                fresh.append(doc)
+        return fresh, duplicate_ids
+
+    def stats(self) -> dict:
+        return {
+            "recipes": len(self.entries),
+            "buckets": len(self.buckets),
+            "threshold": self.threshold,
+            "checked": self.checked,
+            "blocked": self.blocked,
+        }
+
+
+recipe_dedup = register_recipe_index(RecipeDeduplicator(settings.RECIPE_DEDUP_THRESHOLD))
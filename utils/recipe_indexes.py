@@ -0,0 +1,166 @@
+# 레시피 메모리 인덱스 공통 관리
+# 추천/검색 등 요청마다 MongoDB를 훑지 않도록 레시피를 메모리 인덱스로 유지합니다.
+# 앱 시작 시 'recipes' 컬렉션을 한 번 읽어 등록된 모든 인덱스를 만들고, 레시피 저장/수정 시 증분 갱신합니다.
+# 다른 워커 프로세스에서 저장/수정된 레시피는 RECIPE_INDEX_REFRESH_SECONDS 주기로 그 이후 변경분만 읽어 반영하고,
+# 레시피 수가 줄어든 경우(삭제)에만 전체를 다시 구축합니다.
+import asyncio
+import re
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Iterable, Protocol
+from bson import ObjectId
+from core.config import settings
+from db.mongo import get_database
+
+_QUANTITY_UNITS = (
+    "kg", "mg", "g", "ml", "l", "cc", "큰술", "작은술", "티스푼", "스푼", "컵", "개", "모", "대", "줌", "꼬집",
+    "장", "쪽", "알", "마리", "인분", "봉지", "봉", "캔", "근", "tbsp", "tsp", "cups", "cup", "oz", "lb", "t",
+)
+# 숫자로 시작하는 분량(+단위). 재료 이름에 붙어 있어도('우유200ml') 분량 부분만 제거합니다.
+_QUANTITY = re.compile(r"\d[\d.,/~\-]*\s*(?:" + "|".join(_QUANTITY_UNITS) + r")?(?=\s|$)")
+# 고유어 수사로 쓴 분량 ('호두한줌', '간장 두큰술', '양파 반개')
+_NATIVE_QUANTITY = re.compile(r"(?:한|두|세|네|반)\s*(?:" + "|".join(_QUANTITY_UNITS) + r")(?=\s|$)")
+_PARENTHESES = re.compile(r"\([^)]*\)")
+
+
+def normalize_ingredient(text: str) -> str:
+    """'돼지고기 300g', '간장 2큰술(선택)', '땅콩버터2큰술' 같은 재료 문자열에서 분량과 괄호 설명을 제거해 재료 이름만 남깁니다."""
+    text = _PARENTHESES.sub(" ", text or "").lower()
+    text = _QUANTITY.sub(" ", text)
+    # '세모'처럼 이름 전체가 고유어 분량 꼴이면 그대로 둠
+    text = _NATIVE_QUANTITY.sub(" ", text).strip() or text
+    return " ".join(text.split())
+
+
+class RecipeIndex(Protocol):
+    # 인덱스 구축에 필요한 레시피 필드
+    fields: set[str]
+
+    def build(self, docs: list[dict]) -> None: ...
+
+    def add(self, doc: dict) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+_indexes: list[RecipeIndex] = []
+_last_built_at: float | None = None
+_last_refreshed_at: float | None = None
+# 마지막으로 반영한 시점(UTC)과 그때의 레시피 수. 증분 갱신은 이 시점 이후 생성(_id)/수정(updatedAt)된 레시피만 읽습니다.
+_synced_since: datetime | None = None
+_synced_count: int = 0
+# 다른 워커의 시계 차이나 진행 중이던 저장을 놓치지 않도록 증분 조회 구간을 이만큼 겹쳐 읽음 (add는 같은 id를 교체하므로 중복 반영해도 안전)
+_REFRESH_OVERLAP = timedelta(seconds=60)
+
+
+def register_recipe_index(index: RecipeIndex) -> RecipeIndex:
+    """메모리 인덱스를 등록합니다. 등록된 인덱스는 시작 시 구축되고 레시피 저장 시 함께 갱신됩니다."""
+    _indexes.append(index)
+    return index
+
+
+def _projection() -> dict | None:
+    return {field: 1 for index in _indexes for field in index.fields} or None
+
+
+async def _load_recipes(db, query: dict) -> list[dict]:
+    docs: list[dict] = []
+    async for doc in db['recipes'].find(query, _projection()):
+        doc['id'] = str(doc['_id'])
+        docs.append(doc)
+    return docs
+
+
+def _build_all(docs: list[dict]) -> None:
+    for index in _indexes:
+        index.build(docs)
+
+
+async def build_recipe_indexes(db) -> int:
+    """
+    'recipes' 컬렉션을 한 번 순회해 등록된 모든 인덱스를 새로 구축하고 레시피 수를 반환합니다.
+    구축은 이벤트 루프를 막지 않도록 스레드에서 하며, 각 인덱스는 새 구조를 만든 뒤 한 번에 교체합니다.
+    구축 중 이 워커에서 저장된 레시피는 교체로 사라질 수 있으므로 끝난 뒤 그 구간을 증분으로 다시 반영합니다.
+    """
+    global _last_built_at, _synced_since, _synced_count
+    started = datetime.utcnow()
+    docs = await _load_recipes(db, {})
+    await asyncio.to_thread(_build_all, docs)
+    _last_built_at = time.time()
+    _synced_since, _synced_count = started, len(docs)
+    await _apply_changes(db)
+    print(f"[recipe_indexes] {len(docs)}개 레시피로 인덱스 {len(_indexes)}개 구축")
+    return len(docs)
+
+
+async def _apply_changes(db) -> int:
+    global _last_refreshed_at, _synced_since
+    started = datetime.utcnow()
+    since = _synced_since - _REFRESH_OVERLAP
+    docs = await _load_recipes(db, {'$or': [
+        {'_id': {'$gte': ObjectId.from_datetime(since)}},
+        {'updatedAt': {'$gte': since}},
+    ]})
+    index_recipes(docs)
+    _last_refreshed_at = time.time()
+    _synced_since = started
+    return len(docs)
+
+
+async def refresh_recipe_indexes(db) -> int:
+    """
+    마지막 반영 이후 생성되거나 수정된 레시피만 읽어 각 인덱스의 add로 반영하고, 반영한 레시피 수를 반환합니다.
+    레시피 수가 마지막 반영 때보다 줄었으면(다른 워커의 삭제) 증분으로 알 수 없으므로 전체를 다시 구축합니다.
+    """
+    global _synced_count
+    count = await db['recipes'].estimated_document_count()
+    if _synced_since is None or count < _synced_count:
+        return await build_recipe_indexes(db)
+    _synced_count = count
+    return await _apply_changes(db)
+
+
+def index_recipes(docs: Iterable[dict]) -> None:
+    """새로 저장되거나 수정된 레시피(id 필드 포함)를 모든 인덱스에 반영합니다."""
+    docs = list(docs)
+    for index in _indexes:
+        for doc in docs:
+            index.add(doc)
+
+
+def clear_recipe_indexes() -> None:
+    for index in _indexes:
+        index.clear()
+
+
+def recipe_indexes_stats() -> dict:
+    return {
+        "indexes": [type(index).__name__ for index in _indexes],
+        "last_built_at": _last_built_at,
+        "last_refreshed_at": _last_refreshed_at,
+    }
+
+
+async def _refresh_loop(db, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await refresh_recipe_indexes(db)
+        except Exception as e:
+            print(f"[recipe_indexes] 갱신 실패: {e}")
+
+
+# 레시피 인덱스 초기 구축 및 주기적 증분 갱신 (init_db 이후에 실행)
+@asynccontextmanager
+async def init_recipe_indexes(app=None):
+    db = get_database(settings.MONGO_RECIPE_DB_NAME)
+    await build_recipe_indexes(db)
+    refresh_task = None
+    if settings.RECIPE_INDEX_REFRESH_SECONDS > 0:
+        refresh_task = asyncio.create_task(_refresh_loop(db, settings.RECIPE_INDEX_REFRESH_SECONDS))
+    try:
+        yield
+    finally:
+        if refresh_task:
+            refresh_task.cancel()
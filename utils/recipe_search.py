@@ -0,0 +1,235 @@
+# 레시피 전문 검색용 메모리 역색인 (문자 bigram + BM25)
+# 한국어는 '된장찌개'처럼 띄어쓰기 없는 복합어가 많아 공백 단위 토큰으로는 '찌개' 검색이 누락되므로,
+# 단어를 문자 2-gram으로 쪼개 색인합니다. 필드별 가중치를 반영한 BM25로 순위를 매깁니다.
+# 포스팅은 array 기반(슬롯 번호, 가중 빈도)으로 저장하고, 수정/삭제된 레시피는 슬롯을 tombstone 처리한 뒤
+# 죽은 슬롯이 일정 비율을 넘으면 포스팅을 한 번에 압축합니다.
+# 카테고리/난이도/체질 조건은 값별 슬롯 집합을 유지해 검색 시 교집합하고, 포스팅을 훑을 때 조건에 맞는 슬롯만 점수를 매깁니다.
+import heapq
+import math
+import re
+from array import array
+from collections import defaultdict
+from utils.recipe_indexes import normalize_ingredient, register_recipe_index
+
+# 필드별 가중치 (BM25F 방식으로 단어 빈도와 문서 길이에 곱함)
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "tags": 2.0,
+    "ingredients": 1.5,
+    "description": 1.0,
+}
+BM25_K1 = 1.2
+BM25_B = 0.75
+# 질의 bigram 중 이 비율보다 많은 레시피에 나오는 흔한 bigram은 변별력이 낮아 점수 계산에서 건너뜀
+MAX_DF_RATIO = 0.3
+# 죽은 슬롯 비율이 이 값을 넘으면 포스팅 압축
+COMPACT_RATIO = 0.25
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """텍스트를 단어로 나눈 뒤 문자 bigram 목록으로 변환합니다. 한 글자 단어는 그대로 사용합니다."""
+    grams: list[str] = []
+    for word in _WORD.findall((text or "").lower()):
+        if len(word) == 1:
+            grams.append(word)
+        else:
+            grams.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return grams
+
+
+class RecipeSearchIndex:
+    fields = {"title", "description", "ingredients", "tags", "category", "difficulty", "suitableBodyTypes"}
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self) -> None:
+        self.postings: dict[str, tuple[array, array]] = {}   # bigram -> (슬롯 배열, 가중 빈도 배열)
+        self.slot_ids: list[str | None] = []                   # 슬롯 -> 레시피 id (tombstone이면 None)
+        self.slot_meta: list[tuple | None] = []                # 슬롯 -> (카테고리, 난이도, 체질 집합)
+        self.doc_lengths = array("f")                          # 슬롯 -> 가중 문서 길이
+        self.slots: dict[str, int] = {}                        # 레시피 id -> 살아있는 슬롯
+        self.by_category: dict[str, set[int]] = defaultdict(set)      # 카테고리 -> 살아있는 슬롯
+        self.by_difficulty: dict[str, set[int]] = defaultdict(set)    # 난이도 -> 살아있는 슬롯
+        self.by_constitution: dict[str, set[int]] = defaultdict(set)  # 체질 -> 살아있는 슬롯
+        self.total_length = 0.0
+        self.dead = 0
+        self._norms = array("f")        # 슬롯 -> BM25 길이 정규화 값 (검색 시 지연 계산)
+        self._norm_avg_length = 0.0     # _norms를 계산할 때 사용한 평균 문서 길이
+
+    def build(self, docs: list[dict]) -> None:
+        fresh = RecipeSearchIndex()
+        for doc in docs:
+            fresh.add(doc)
+        self.__dict__.update(fresh.__dict__)
+
+    @staticmethod
+    def _field_terms(doc: dict) -> tuple[dict[str, float], float]:
+        """레시피의 bigram별 가중 빈도와 가중 문서 길이를 계산합니다."""
+        texts = {
+            "title": [doc.get("title") or ""],
+            "description": [doc.get("description") or ""],
+            "ingredients": [normalize_ingredient(i) for i in doc.get("ingredients") or []],
+            "tags": doc.get("tags") or [],
+        }
+        frequencies: dict[str, float] = {}
+        length = 0.0
+        for field, values in texts.items():
+            weight = FIELD_WEIGHTS[field]
+            for value in values:
+                for gram in tokenize(value):
+                    frequencies[gram] = frequencies.get(gram, 0.0) + weight
+                    length += weight
+        return frequencies, length
+
+    def _index_facets(self, slot: int, meta: tuple) -> None:
+        category, difficulty, body_types = meta
+        if category:
+            self.by_category[category].add(slot)
+        if difficulty:
+            self.by_difficulty[difficulty].add(slot)
+        for body_type in body_types:
+            self.by_constitution[body_type].add(slot)
+
+    def _remove(self, recipe_id: str) -> None:
+        slot = self.slots.pop(recipe_id, None)
+        if slot is None:
+            return
+        category, difficulty, body_types = self.slot_meta[slot]
+        if category:
+            self.by_category[category].discard(slot)
+        if difficulty:
+            self.by_difficulty[difficulty].discard(slot)
+        for body_type in body_types:
+            self.by_constitution[body_type].discard(slot)
+        self.slot_ids[slot] = None
+        self.slot_meta[slot] = None
+        self.total_length -= self.doc_lengths[slot]
+        self.dead += 1
+
+    def add(self, doc: dict) -> None:
+        recipe_id = doc["id"]
+        self._remove(recipe_id)
+        frequencies, length = self._field_terms(doc)
+        slot = len(self.slot_ids)
+        self.slot_ids.append(recipe_id)
+        meta = (doc.get("category"), doc.get("difficulty"), frozenset(doc.get("suitableBodyTypes") or []))
+        self.slot_meta.append(meta)
+        self._index_facets(slot, meta)
+        self.doc_lengths.append(length)
+        self.slots[recipe_id] = slot
+        self.total_length += length
+        for gram, frequency in frequencies.items():
+            posting = self.postings.get(gram)
+            if posting is None:
+                posting = self.postings[gram] = (array("i"), array("f"))
+            posting[0].append(slot)
+            posting[1].append(frequency)
+        if self.dead > COMPACT_RATIO * len(self.slot_ids) and self.dead > 1000:
+            self._compact()
+
+    def _compact(self) -> None:
+        """tombstone 슬롯을 제거하고 살아있는 슬롯 번호를 다시 매깁니다."""
+        remap = array("i", [-1]) * len(self.slot_ids)
+        slot_ids, slot_meta, doc_lengths = [], [], array("f")
+        for old, recipe_id in enumerate(self.slot_ids):
+            if recipe_id is not None:
+                remap[old] = len(slot_ids)
+                slot_ids.append(recipe_id)
+                slot_meta.append(self.slot_meta[old])
+                doc_lengths.append(self.doc_lengths[old])
+        postings = {}
+        for gram, (slots, frequencies) in self.postings.items():
+            new_slots, new_frequencies = array("i"), array("f")
+            for slot, frequency in zip(slots, frequencies):
+                if remap[slot] >= 0:
+                    new_slots.append(remap[slot])
+                    new_frequencies.append(frequency)
+            if new_slots:
+                postings[gram] = (new_slots, new_frequencies)
+        self.postings = postings
+        self.slot_ids, self.slot_meta, self.doc_lengths = slot_ids, slot_meta, doc_lengths
+        self.slots = {recipe_id: slot for slot, recipe_id in enumerate(slot_ids)}
+        self.by_category, self.by_difficulty, self.by_constitution = defaultdict(set), defaultdict(set), defaultdict(set)
+        for slot, meta in enumerate(slot_meta):
+            self._index_facets(slot, meta)
+        self.dead = 0
+        self._norms = array("f")
+
+    def _length_norms(self) -> array:
+        """슬롯별 BM25 길이 정규화 값을 반환합니다. 평균 문서 길이가 크게 바뀌었을 때만 다시 계산합니다."""
+        avg_length = self.total_length / max(len(self.slots), 1) or 1.0
+        stale = abs(avg_length - self._norm_avg_length) > 0.05 * avg_length
+        if stale or len(self._norms) != len(self.doc_lengths):
+            if stale:
+                self._norms = array("f")
+                self._norm_avg_length = avg_length
+            base, scale = BM25_K1 * (1 - BM25_B), BM25_K1 * BM25_B / self._norm_avg_length
+            self._norms.extend(base + scale * length for length in self.doc_lengths[len(self._norms):])
+        return self._norms
+
+    def search(self, query: str, category: str | None = None, difficulty: str | None = None,
+               constitution: str | None = None, excluded_ids: set[str] | None = None,
+               limit: int = 20) -> list[str]:
+        """
+        질의와 일치하는 레시피 id를 BM25 점수 내림차순으로 반환합니다.
+        카테고리/난이도/체질 조건과 알레르기 등으로 제외할 레시피(excluded_ids)를 함께 적용합니다.
+        """
+        live = len(self.slots)
+        grams = list(dict.fromkeys(tokenize(query)))
+        if not live or not grams:
+            return []
+        terms = [(gram, self.postings[gram]) for gram in grams if gram in self.postings]
+        if len(terms) > 1:
+            rare = [term for term in terms if len(term[1][0]) <= MAX_DF_RATIO * live]
+            terms = rare or terms
+        # 조건이 있으면 값별 슬롯 집합을 작은 것부터 교집합해 점수를 매길 슬롯을 미리 정함
+        facets = [facet.get(value, set()) for facet, value in (
+            (self.by_category, category), (self.by_difficulty, difficulty), (self.by_constitution, constitution),
+        ) if value]
+        allowed: set[int] | None = None
+        if facets:
+            facets.sort(key=len)
+            allowed = facets[0].intersection(*facets[1:])
+            if not allowed:
+                return []
+
+        norms = self._length_norms()
+        scores: dict[int, float] = {}
+        get = scores.get
+        for _, (slots, frequencies) in terms:
+            df = len(slots)
+            idf = math.log(1 + (live - df + 0.5) / (df + 0.5)) * (BM25_K1 + 1)
+            if allowed is None:
+                for slot, frequency in zip(slots, frequencies):
+                    scores[slot] = get(slot, 0.0) + idf * frequency / (frequency + norms[slot])
+            else:
+                for slot, frequency in zip(slots, frequencies):
+                    if slot in allowed:
+                        scores[slot] = get(slot, 0.0) + idf * frequency / (frequency + norms[slot])
+
+        excluded = excluded_ids or set()
+        slot_ids = self.slot_ids
+
+        def matches(slot: int) -> bool:
+            recipe_id = slot_ids[slot]
+            return recipe_id is not None and recipe_id not in excluded
+
+        # 점수 상위 후보부터 제외 여부를 확인하고, 제외되어 부족할 때만 전체 후보를 훑음
+        ranked = heapq.nlargest(limit * 4, scores, key=scores.__getitem__)
+        top = [slot for slot in ranked if matches(slot)][:limit]
+        if len(top) < limit and len(ranked) < len(scores):
+            top = heapq.nlargest(limit, (slot for slot in scores if matches(slot)), key=scores.__getitem__)
+        return [slot_ids[slot] for slot in top]
+
+    def stats(self) -> dict:
+        return {
+            "recipes": len(self.slots),
+            "terms": len(self.postings),
+            "dead_slots": self.dead,
+        }
+
+
+recipe_search_index = register_recipe_index(RecipeSearchIndex())
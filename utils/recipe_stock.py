@@ -0,0 +1,129 @@
+# 자동 생성 레시피 재고 보충
+# POST /recipes/auto_generate가 LLM 호출을 기다리지 않도록 칸(체질, 카테고리, 난이도)별로 미리 생성한 레시피를
+# 'recipe_stock'에 쌓아 두고, 주기마다 칸별 소진 속도(지수이동평균)에 맞춰 목표 재고까지 채웁니다.
+# 목표 재고 = 소진 속도 x RECIPE_STOCK_LEAD_TICKS (RECIPE_STOCK_MIN_PER_CELL ~ RECIPE_STOCK_MAX_PER_CELL)
+# 재고를 꺼낼 때는 요청한 주요 재료를 모두 포함한 재고만 쓰므로, 보충할 때도 칸의 최근 요청에서 자주 나온 주요 재료 조합을
+# 요청 비율대로 지정해 생성합니다. (재료를 지정하지 않은 요청 비율만큼은 재료 없이 생성)
+# 재고 사용(RECIPE_STOCK_ENABLED)은 모든 워커에서, 보충(RECIPE_STOCK_REFILLER_ENABLED)은 한 워커에서만 켭니다.
+import asyncio
+import math
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from core.config import settings
+from core.http_client import fetch_generated_recipes
+from crud.recipe import validate_recipes
+from crud.recipe_stock import take_recipe_stock, add_recipe_stock, roll_stock_demand, stock_cell
+from db.mongo import get_database
+
+# 소진 속도 지수이동평균의 가중치 (클수록 최근 수요를 빠르게 반영)
+DEMAND_EWMA_ALPHA = 0.3
+
+_metrics = {
+    "hits": 0,              # 재고에서 바로 반환한 요청 수
+    "misses": 0,            # 재고가 없어 실시간 생성으로 넘어간 요청 수
+    "refilled": 0,          # 보충한 재고 수
+    "refill_failures": 0,
+    "last_refill_at": None,
+    "last_refill_seconds": None,
+}
+
+
+def recipe_stock_stats() -> dict:
+    served = _metrics["hits"] + _metrics["misses"]
+    return {
+        **_metrics,
+        "hit_ratio": round(_metrics["hits"] / served, 4) if served else None,
+    }
+
+
+async def take_stocked_recipes(db, payload: dict) -> list[dict] | None:
+    """재고 사용이 켜져 있으면 요청 칸의 재고를 꺼내 반환합니다. 재고가 없으면 None을 반환합니다."""
+    if not settings.RECIPE_STOCK_ENABLED:
+        return None
+    recipes = await take_recipe_stock(db, payload)
+    _metrics["hits" if recipes else "misses"] += 1
+    return recipes
+
+
+def stock_target(rate: float) -> int:
+    """칸의 소진 속도(보충 주기당 요청 수)로 목표 재고 수를 계산합니다."""
+    target = math.ceil(rate * settings.RECIPE_STOCK_LEAD_TICKS)
+    return max(settings.RECIPE_STOCK_MIN_PER_CELL, min(settings.RECIPE_STOCK_MAX_PER_CELL, target))
+
+
+def key_ingredient_mix(recent: list[list[str]], count: int) -> list[list[str]]:
+    """
+    칸의 최근 요청별 주요 재료 목록에서 보충할 count건의 주요 재료를 정합니다.
+    자주 요청된 조합부터 요청 비율만큼(최소 1건) 배정하며, 기록이 없으면 재료 없이 생성합니다.
+    """
+    counts = Counter(tuple(sorted(ingredients)) for ingredients in recent)
+    if not counts:
+        return [[] for _ in range(count)]
+    total = sum(counts.values())
+    mix: list[list[str]] = []
+    for ingredients, n in counts.most_common():
+        mix.extend([list(ingredients)] * max(1, round(count * n / total)))
+    # 반올림으로 모자라면 자주 요청된 조합부터 하나씩 더 배정
+    while len(mix) < count:
+        mix.extend(list(ingredients) for ingredients, _ in counts.most_common())
+    return mix[:count]
+
+
+async def refill_recipe_stock(db) -> int:
+    """칸별 부족분을 계산해 생성 요청을 동시에(상한 RECIPE_STOCK_REFILL_CONCURRENCY) 보내고, 채운 재고 수를 반환합니다."""
+    started = time.perf_counter()
+    cells = await roll_stock_demand(db, DEMAND_EWMA_ALPHA)
+    jobs: list[tuple[float, dict]] = []
+    for cell in cells:
+        deficit = stock_target(cell.get("rate") or 0.0) - cell["stock"]
+        mix = key_ingredient_mix(cell.get("recent_key_ingredients") or [], max(deficit, 0))
+        for i, key_ingredients in enumerate(mix):
+            # 재고가 바닥난 칸과 빨리 소진되는 칸부터 채움
+            priority = (cell["stock"] + i) / ((cell.get("rate") or 0.0) + 1e-3)
+            jobs.append((priority, {**stock_cell(cell), "keyIngredients": key_ingredients or None}))
+    jobs.sort(key=lambda job: job[0])
+    jobs = jobs[:settings.RECIPE_STOCK_MAX_REFILL_PER_TICK]
+    semaphore = asyncio.Semaphore(settings.RECIPE_STOCK_REFILL_CONCURRENCY)
+
+    async def refill(job: dict) -> bool:
+        async with semaphore:
+            try:
+                recipes = validate_recipes(await fetch_generated_recipes(job))
+                await add_recipe_stock(db, stock_cell(job), recipes, job["keyIngredients"])
+                return bool(recipes)
+            except Exception as e:
+                print(f"[recipe_stock] {job} 보충 실패: {e}")
+                _metrics["refill_failures"] += 1
+                return False
+
+    refilled = sum(await asyncio.gather(*(refill(job) for _, job in jobs)))
+    _metrics["refilled"] += refilled
+    _metrics["last_refill_at"] = time.time()
+    _metrics["last_refill_seconds"] = round(time.perf_counter() - started, 3)
+    if jobs:
+        print(f"[recipe_stock] 칸 {len(cells)}개 중 부족분 {len(jobs)}건 요청, {refilled}건 보충")
+    return refilled
+
+
+async def _refill_loop(db, interval: float) -> None:
+    while True:
+        try:
+            await refill_recipe_stock(db)
+        except Exception as e:
+            print(f"[recipe_stock] 보충 실패: {e}")
+        await asyncio.sleep(interval)
+
+
+# 레시피 재고 보충 작업 (init_db, init_ai_client 이후에 실행)
+@asynccontextmanager
+async def init_recipe_stock(app=None):
+    refill_task = None
+    if settings.RECIPE_STOCK_REFILLER_ENABLED:
+        db = get_database(settings.MONGO_RECIPE_DB_NAME)
+        refill_task = asyncio.create_task(_refill_loop(db, settings.RECIPE_STOCK_REFILL_SECONDS))
+    try:
+        yield
+    finally:
+        if refill_task:
+            refill_task.cancel()
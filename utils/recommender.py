@@ -0,0 +1,145 @@
+# 개인화 레시피 추천용 메모리 역색인
+# 체질 -> 레시피 id, 태그/재료 -> 레시피 id 역색인으로 후보와 건강 목표 일치 여부를 구하고,
+# 미리 정렬해 둔 평점 순서를 따라가며 점수를 매기다 남은 후보가 top-k에 들 수 없으면 멈춥니다.
+import heapq
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Iterable
+from utils.recipe_indexes import normalize_ingredient, register_recipe_index
+
+# 점수 가중치
+CONSTITUTION_WEIGHT = 3.0
+HEALTH_GOAL_WEIGHT = 1.0
+RATING_WEIGHT = 1.0  # 평점(0~5)을 0~1로 정규화해 곱함
+
+
+def _rating_score(rating: float) -> float:
+    return RATING_WEIGHT * min(rating, 5.0) / 5.0
+
+
+class RecipeRecommender:
+    fields = {"suitableBodyTypes", "ingredients", "keyIngredients", "tags", "rating"}
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self) -> None:
+        self.by_constitution: dict[str, set[str]] = defaultdict(set)
+        self.by_tag: dict[str, set[str]] = defaultdict(set)
+        self.by_ingredient: dict[str, set[str]] = defaultdict(set)
+        self.meta: dict[str, dict] = {}
+        self.rating_order: list[tuple[float, str]] = []   # (-평점, 레시피 id) 오름차순 = 평점 내림차순
+        self._goal_cache: dict[str, set[str]] = {}        # 건강 목표 -> 매칭되는 레시피 id
+
+    def build(self, docs: list[dict]) -> None:
+        fresh = RecipeRecommender()
+        for doc in docs:
+            fresh._index(doc)
+        # 레시피마다 insort하지 않고 한 번에 정렬
+        fresh.rating_order = sorted((-meta["rating"], rid) for rid, meta in fresh.meta.items())
+        self.__dict__.update(fresh.__dict__)
+
+    def _remove(self, recipe_id: str) -> None:
+        meta = self.meta.pop(recipe_id, None)
+        if not meta:
+            return
+        for body_type in meta["body_types"]:
+            self.by_constitution[body_type].discard(recipe_id)
+        for tag in meta["tags"]:
+            self.by_tag[tag].discard(recipe_id)
+        for ingredient in meta["ingredients"]:
+            self.by_ingredient[ingredient].discard(recipe_id)
+        key = (-meta["rating"], recipe_id)
+        pos = bisect_left(self.rating_order, key)
+        if pos < len(self.rating_order) and self.rating_order[pos] == key:
+            del self.rating_order[pos]
+
+    def add(self, doc: dict) -> None:
+        self._remove(doc["id"])
+        rating = self._index(doc)
+        insort(self.rating_order, (-rating, doc["id"]))
+        self._goal_cache.clear()
+
+    def _index(self, doc: dict) -> float:
+        """평점 순서를 제외한 역색인에 레시피를 추가하고 평점을 반환합니다."""
+        recipe_id = doc["id"]
+        body_types = set(doc.get("suitableBodyTypes") or [])
+        ingredients = {normalize_ingredient(i) for i in doc.get("ingredients") or []}
+        ingredients |= {i.lower() for i in doc.get("keyIngredients") or []}
+        ingredients.discard("")
+        tags = {t.lower() for t in doc.get("tags") or []}
+        rating = float(doc.get("rating") or 0.0)
+        self.meta[recipe_id] = {
+            "body_types": body_types,
+            "ingredients": ingredients,
+            "tags": tags,
+            "rating": rating,
+        }
+        for body_type in body_types:
+            self.by_constitution[body_type].add(recipe_id)
+        for tag in tags:
+            self.by_tag[tag].add(recipe_id)
+        for ingredient in ingredients:
+            self.by_ingredient[ingredient].add(recipe_id)
+        return rating
+
+    def _goal_matches(self, goal: str) -> set[str]:
+        """태그와 서로 포함 관계이거나 재료 이름에 포함되는 건강 목표에 해당하는 레시피 id (어휘만 훑고 결과를 캐시)."""
+        cached = self._goal_cache.get(goal)
+        if cached is None:
+            cached = set()
+            for tag, recipe_ids in self.by_tag.items():
+                if goal in tag or tag in goal:
+                    cached |= recipe_ids
+            for ingredient, recipe_ids in self.by_ingredient.items():
+                if goal in ingredient:
+                    cached |= recipe_ids
+            self._goal_cache[goal] = cached
+        return cached
+
+    def recommend(self, constitution: str | None = None, health_goals: Iterable[str] = (),
+                  excluded_ids: set[str] | None = None, limit: int = 20) -> list[str]:
+        """
+        사용자 체질/건강 목표에 맞는 레시피 id를 점수 내림차순으로 반환합니다.
+        알레르기 등으로 제외할 레시피는 excluded_ids로 받습니다. (utils.allergen_filter 참고)
+        """
+        pool = (self.by_constitution.get(constitution) if constitution else None) or None
+        base = CONSTITUTION_WEIGHT if pool is not None else 0.0
+        excluded = excluded_ids or set()
+        goals = {g.strip().lower() for g in health_goals if g and g.strip()}
+        goal_sets = [matches for matches in (self._goal_matches(goal) for goal in goals) if matches]
+        # 아직 평점 순서에서 만나지 않은, 목표 점수를 받을 수 있는 후보
+        pending = set().union(*goal_sets)
+        if pool is not None:
+            pending &= pool
+        pending -= excluded
+        max_goal_score = HEALTH_GOAL_WEIGHT * len(goal_sets)
+
+        # 평점 내림차순으로 후보를 보며 top-k(최소 힙)를 채우고, 남은 후보가 받을 수 있는 최고 점수가
+        # 현재 k번째 점수 이하가 되면 멈춤
+        top: list[tuple[float, str]] = []
+        for neg_rating, rid in self.rating_order:
+            rating_score = _rating_score(-neg_rating)
+            if len(top) >= limit and base + (max_goal_score if pending else 0.0) + rating_score <= top[0][0]:
+                break
+            if rid in excluded or (pool is not None and rid not in pool):
+                continue
+            pending.discard(rid)
+            hits = sum(1 for matches in goal_sets if rid in matches)
+            item = (base + HEALTH_GOAL_WEIGHT * hits + rating_score, rid)
+            if len(top) < limit:
+                heapq.heappush(top, item)
+            elif item > top[0]:
+                heapq.heapreplace(top, item)
+        return [rid for _, rid in sorted(top, reverse=True)]
+
+    def stats(self) -> dict:
+        return {
+            "recipes": len(self.meta),
+            "constitutions": len(self.by_constitution),
+            "tags": len(self.by_tag),
+            "ingredients": len(self.by_ingredient),
+        }
+
+
+recipe_recommender = register_recipe_index(RecipeRecommender())
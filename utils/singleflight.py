@@ -0,0 +1,42 @@
+# 동일 요청 합치기 (single-flight)
+# 같은 키의 작업이 이미 진행 중이면 새로 시작하지 않고 진행 중인 작업의 결과를 함께 받습니다.
+# 작업은 별도 태스크로 실행하므로, 처음 요청한 클라이언트가 연결을 끊어도 기다리는 다른 요청은 결과를 받습니다.
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.calls = 0           # do() 호출 수
+        self.executions = 0      # 실제로 실행한 작업 수
+        self.errors = 0
+
+    def _done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            # 기다리는 요청이 모두 취소된 경우에도 예외가 처리된 것으로 표시
+            self.errors += 1
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """key에 대해 진행 중인 작업이 있으면 그 결과를, 없으면 fn()을 실행해 결과를 반환합니다. (결과 객체는 공유되므로 수정 금지)"""
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+            self.executions += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        coalesced = self.calls - self.executions
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": coalesced,
+            "in_flight": len(self._inflight),
+            "errors": self.errors,
+            "saved_ratio": round(coalesced / self.calls, 4) if self.calls else 0.0,
+        }